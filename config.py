@@ -528,6 +528,9 @@ MILESTONES = (
     [2000, 3000, 4000, 5000, 10000]
 )
 
+# Highest first, so the milestone check can stop at the first already-reached one
+MILESTONES_DESC = tuple(sorted(MILESTONES, reverse=True))
+
 # Milestones that trigger a Telegram post (subset of MILESTONES)
 # All milestones still recorded in database for analytics
 MILESTONE_POST_THRESHOLDS = [
@@ -205,6 +205,12 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_smart_wallet_timestamp
                 ON smart_wallet_activity(timestamp)
             ''')
+            # Recent posted signals (performance tracker polls these every 15s)
+            await conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_signals_posted_created
+                ON signals(created_at DESC)
+                WHERE signal_posted = TRUE
+            ''')
 
             # Whale wallets table (from historical data collector)
             await conn.execute('''
@@ -395,6 +401,42 @@ class Database:
                     ON CONFLICT (token_address, milestone) DO NOTHING
                 ''', token_address, milestone, price, signal['created_at'])
     
+    async def apply_signal_updates(self, price_rows: List[tuple], milestone_rows: List[tuple], graduated: List[str]):
+        """
+        Persist one performance-check cycle in a single transaction
+
+        Args:
+            price_rows: (token_address, current_price) - also tracks peak price
+            milestone_rows: (token_address, milestone, price) - skipped if already recorded
+            graduated: token addresses that moved from pump.fun to Raydium
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                if price_rows:
+                    await conn.executemany('''
+                        UPDATE signals
+                        SET current_price = $2,
+                            max_price_reached = GREATEST(COALESCE(max_price_reached, 0), $2),
+                            updated_at = NOW()
+                        WHERE token_address = $1
+                    ''', price_rows)
+
+                if milestone_rows:
+                    await conn.executemany('''
+                        INSERT INTO performance (token_address, milestone, price_at_milestone, time_to_milestone)
+                        SELECT $1, $2::real, $3::real, NOW() - created_at
+                        FROM signals
+                        WHERE token_address = $1
+                        ON CONFLICT (token_address, milestone) DO NOTHING
+                    ''', milestone_rows)
+
+                if graduated:
+                    await conn.execute('''
+                        UPDATE signals
+                        SET signal_type = 'POST_GRADUATION'
+                        WHERE token_address = ANY($1::text[])
+                    ''', graduated)
+    
     async def insert_kol_buy(self, token_address: str, kol_wallet: str, amount_sol: float, tx_sig: str):
         """Record a KOL buy"""
         async with self.pool.acquire() as conn:
@@ -432,6 +474,49 @@ class Database:
             ''')
             return [dict(row) for row in rows]
 
+    async def get_daily_stats(self, use_peak_price: bool = False) -> Dict:
+        """
+        Aggregate today's posted signals in one query
+
+        Multiples use current_price, or the peak price (max_price_reached, falling
+        back to current_price) when use_peak_price is set. Returns total_signals,
+        priced (signals with a usable price), winners (2x+), flat (1-2x) and
+        avg_gain (%).
+        """
+        price = "COALESCE(NULLIF(max_price_reached, 0), current_price)" if use_peak_price else "current_price"
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(f'''
+                SELECT COUNT(*) AS total_signals,
+                       COUNT(multiple) AS priced,
+                       COUNT(*) FILTER (WHERE multiple >= 2) AS winners,
+                       COUNT(*) FILTER (WHERE multiple >= 1 AND multiple < 2) AS flat,
+                       COALESCE(AVG((multiple - 1) * 100), 0) AS avg_gain
+                FROM (
+                    SELECT CASE WHEN entry_price > 0 AND {price} <> 0
+                                THEN {price} / entry_price END AS multiple
+                    FROM signals
+                    WHERE signal_posted = TRUE
+                    AND DATE(created_at) = CURRENT_DATE
+                ) today
+            ''')
+            return dict(row)
+
+    async def get_top_signals_today(self, limit: int = 10) -> List[Dict]:
+        """Get today's best performing posted signals by current multiple"""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch('''
+                SELECT token_symbol, signal_type, conviction_score,
+                       current_price / entry_price AS multiple
+                FROM signals
+                WHERE signal_posted = TRUE
+                AND DATE(created_at) = CURRENT_DATE
+                AND entry_price > 0
+                AND current_price <> 0
+                ORDER BY multiple DESC
+                LIMIT $1
+            ''', limit)
+            return [dict(row) for row in rows]
+
     async def get_total_signal_count(self) -> int:
         """Get total count of all signals ever posted"""
         async with self.pool.acquire() as conn:
@@ -487,6 +572,25 @@ class Database:
                 ON CONFLICT (transaction_signature) DO NOTHING
             ''', wallet_address, wallet_name, wallet_tier, token_address,
                 transaction_type, amount, transaction_signature, timestamp, win_rate, pnl_30d)
+
+    async def insert_smart_wallet_activity_batch(self, rows: List[tuple]):
+        """
+        Record many smart wallet activity rows in a single transaction
+
+        Args:
+            rows: (wallet_address, wallet_name, wallet_tier, token_address, transaction_type,
+                   amount, transaction_signature, timestamp, win_rate, pnl_30d) - same
+                   order as insert_smart_wallet_activity; duplicate signatures are skipped
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany('''
+                    INSERT INTO smart_wallet_activity
+                    (wallet_address, wallet_name, wallet_tier, token_address,
+                     transaction_type, amount, transaction_signature, timestamp, win_rate, pnl_30d)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+                    ON CONFLICT (transaction_signature) DO NOTHING
+                ''', rows)
     
     async def get_smart_wallet_activity(
         self, 
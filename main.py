@@ -44,6 +44,13 @@ except ImportError:
     APSCHEDULER_AVAILABLE = False
     logger.warning("⚠️  APScheduler not installed - daily pipeline will not run automatically")
 
+# libuv-based event loop for the whole process (WS, aiohttp, asyncpg all support it)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # ============================================================================
 # GLOBAL INSTANCES
 # ============================================================================
@@ -648,6 +655,9 @@ async def lifespan(app: FastAPI):
     if performance_tracker:
         await performance_tracker.stop()
 
+    if smart_wallet_tracker:
+        await smart_wallet_tracker.stop()  # Flush queued KOL buys before the pool closes
+
     if telegram_monitor:
         await telegram_monitor.stop()
 
@@ -1069,4 +1079,6 @@ async def pumpportal_diagnostic():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    if UVLOOP_AVAILABLE:
+        uvloop.install()  # Before uvicorn creates the loop
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop" if UVLOOP_AVAILABLE else "asyncio")
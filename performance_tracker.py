@@ -4,13 +4,65 @@ Dual tracking: pump.fun (pre-grad) + DexScreener (post-grad)
 """
 import asyncio
 import aiohttp
+import asyncpg
 import json
+import orjson
+import time
 import websockets
-from typing import Dict, List
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
 from loguru import logger
 import config
-from config import MILESTONES
+from config import MILESTONES, MILESTONES_DESC
+
+# DexScreener's multi-token endpoint accepts up to 30 comma-separated addresses
+DEXSCREENER_BATCH_SIZE = 30
+
+# Max signal price checks in flight at once
+SIGNAL_CHECK_CONCURRENCY = 16
+
+# HTTP price cache: entries younger than the TTL are served from memory. Kept below
+# the 15s monitoring tick so fresh signals still get a new price every cycle.
+PRICE_CACHE_TTL = 10
+PRICE_CACHE_MAX = 10_000
+
+# Milestones as floats for binding to a real[] query parameter
+MILESTONE_PARAM = [float(m) for m in MILESTONES]
+
+# Max pre-grad prices kept from the PumpPortal WebSocket (oldest evicted first)
+PUMPPORTAL_PRICES_MAX = 5000
+PRICE_UNCHANGED_TOLERANCE = 1e-6  # Relative move below this is "no trade" (covers REAL rounding)
+PUMPPORTAL_QUEUE_MAX = 10_000  # Raw WS frames awaiting the parser; newest frames are dropped when full
+
+# Telegram's max message length (combined milestone posts are split to fit)
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+# Compact milestone caption (fits 1024 char video caption limit)
+MILESTONE_TEMPLATE = (
+    "\U0001f525 <b>PROMETHEUS | {milestone}x</b>\n\n"
+    "<b>${symbol}</b> hit <b>{milestone}x</b>\n\n"
+    "\U0001f4b0 Entry: ${entry_price:.8f}\n"
+    "\U0001f48e Current: ${current_price:.8f}\n"
+    "\U0001f4c8 Gain: <b>+{gain_pct:.1f}%</b>\n"
+    "\u23f1\ufe0f Time: {hours}h {minutes}m\n\n"
+    '<a href="https://dexscreener.com/solana/{token_address}">DexS</a>'
+    ' | <a href="https://birdeye.so/token/{token_address}">Bird</a>'
+    ' | <a href="https://pump.fun/{token_address}">Pump</a>\n\n'
+    "<code>{token_address}</code>"
+)
+
+@dataclass
+class SignalUpdate:
+    """Result of one signal price check, written to the DB in a per-cycle batch"""
+    signal: Dict
+    signal_type: str
+    current_price: float
+    multiple: float
+    milestones_hit: List[float] = field(default_factory=list)  # Highest first
+    graduated: bool = False
+
 
 class PerformanceTracker:
     """
@@ -27,17 +79,37 @@ class PerformanceTracker:
         self.telegram = telegram_publisher
         self.session = None
         self.running = False
+        self._stop_event = asyncio.Event()  # Set by stop() to wake sleeping loops
         self.pumpportal_ws = None
-        self.pumpportal_prices = {}  # {token_address: current_price} for pre-grad tokens
+        self.pumpportal_prices = OrderedDict()  # {token_address: current_price} for pre-grad tokens, LRU order
+        self._tracked_addrs = set()  # Pre-grad signal tokens subscribed on the PumpPortal WebSocket
+        self._ws_queue = asyncio.Queue(maxsize=PUMPPORTAL_QUEUE_MAX)  # Raw frames -> _ws_parser_loop
+        self.check_sem = asyncio.Semaphore(SIGNAL_CHECK_CONCURRENCY)
+        # (source, token_address) -> (price, monotonic fetch time), LRU order
+        self._price_cache: OrderedDict = OrderedDict()
     
     async def start(self):
         """Start performance monitoring loop"""
         self.running = True
-        self.session = aiohttp.ClientSession()
+        self._stop_event.clear()
+        # Keep-alive pool sized for the two hosts polled every cycle (DexScreener, PumpPortal)
+        connector = aiohttp.TCPConnector(
+            limit=50,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10, connect=3),
+            headers={'User-Agent': 'sentinel/2'},
+            raise_for_status=True  # Non-2xx raises ClientResponseError in the price getters
+        )
         logger.info("📊 Performance tracker started")
         
         # Run monitoring loops
         asyncio.create_task(self._pumpportal_websocket_loop())
+        asyncio.create_task(self._ws_parser_loop())
         asyncio.create_task(self._monitoring_loop())
         asyncio.create_task(self._daily_report_loop())
         asyncio.create_task(self._outcome_tracking_loop())  # OPT-000 prerequisite
@@ -45,6 +117,11 @@ class PerformanceTracker:
     async def stop(self):
         """Stop monitoring"""
         self.running = False
+        self._stop_event.set()
+        try:
+            self._ws_queue.put_nowait(None)  # Wake the parser so it can exit
+        except asyncio.QueueFull:
+            pass
         if self.pumpportal_ws:
             await self.pumpportal_ws.close()
         if self.session:
@@ -65,34 +142,85 @@ class PerformanceTracker:
                     self.pumpportal_ws = ws
                     logger.info("✅ Performance tracker connected to PumpPortal")
                     
-                    # Subscribe to all token trades
-                    await ws.send(json.dumps({
-                        "method": "subscribeTokenTrade",
-                        "keys": ["*"]
-                    }))
+                    # Subscribe only to trades for tokens we're tracking (refreshed each check cycle)
+                    if self._tracked_addrs:
+                        await ws.send(json.dumps({
+                            "method": "subscribeTokenTrade",
+                            "keys": list(self._tracked_addrs)
+                        }))
                     
-                    # Listen for price updates
+                    # Hand raw frames to _ws_parser_loop; drop them rather than stall the socket
                     async for message in ws:
                         try:
-                            data = json.loads(message)
-                            
-                            # Get price updates for tokens we're tracking
-                            if data.get('txType') in ['buy', 'sell']:
-                                token_address = data.get('mint')
-                                price_usd = data.get('priceUsd', 0)
-                                
-                                if token_address and price_usd:
-                                    # Store current price
-                                    self.pumpportal_prices[token_address] = float(price_usd)
-                                    
-                        except json.JSONDecodeError:
-                            continue
-                        except Exception as e:
-                            logger.debug(f"Error processing PumpPortal message: {e}")
+                            self._ws_queue.put_nowait(message)
+                        except asyncio.QueueFull:
+                            pass
                             
             except Exception as e:
                 logger.warning(f"⚠️ PumpPortal WebSocket error: {e}. Reconnecting in 5s...")
-                await asyncio.sleep(5)
+                await self._wait_for_stop(5)
+
+    async def _ws_parser_loop(self):
+        """Single writer for pumpportal_prices: parse queued PumpPortal frames"""
+        while self.running:
+            message = await self._ws_queue.get()
+            if message is None:
+                break
+            try:
+                data = orjson.loads(message)
+                
+                # Get price updates for tokens we're tracking
+                if data.get('txType') in ['buy', 'sell']:
+                    token_address = data.get('mint')
+                    price_usd = data.get('priceUsd', 0)
+                    
+                    if token_address in self._tracked_addrs and price_usd:
+                        # Store current price
+                        self.pumpportal_prices[token_address] = float(price_usd)
+                        self.pumpportal_prices.move_to_end(token_address)
+                        if len(self.pumpportal_prices) > PUMPPORTAL_PRICES_MAX:
+                            self.pumpportal_prices.popitem(last=False)
+                        
+            except orjson.JSONDecodeError:
+                continue
+            except Exception as e:
+                logger.debug(f"Error processing PumpPortal message: {e}")
+
+    async def _refresh_tracked_tokens(self, signals: List[Dict]):
+        """
+        Narrow the PumpPortal subscription to the active pre-grad signals
+
+        Subscribes new tokens, unsubscribes dropped ones and forgets their cached
+        prices, so the WebSocket only delivers trades we actually price.
+        """
+        tracked = {s['token_address'] for s in signals if s.get('signal_type') == 'PRE_GRADUATION'}
+        added = tracked - self._tracked_addrs
+        removed = self._tracked_addrs - tracked
+        self._tracked_addrs = tracked
+
+        for token_address in removed:
+            self.pumpportal_prices.pop(token_address, None)
+
+        ws = self.pumpportal_ws
+        if not ws or not (added or removed):
+            return
+
+        try:
+            if removed:
+                await ws.send(json.dumps({"method": "unsubscribeTokenTrade", "keys": list(removed)}))
+            if added:
+                await ws.send(json.dumps({"method": "subscribeTokenTrade", "keys": list(added)}))
+        except Exception as e:
+            # Reconnect resubscribes the full tracked set
+            logger.debug(f"Could not update PumpPortal subscription: {e}")
+
+    async def _wait_for_stop(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds, waking early on stop(). Returns True if stopped."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
     
     async def _monitoring_loop(self):
         """Main monitoring loop - adaptive polling.
@@ -103,29 +231,30 @@ class PerformanceTracker:
             try:
                 await self._check_all_signals(cycle)
                 cycle += 1
-                await asyncio.sleep(15)
+                await self._wait_for_stop(15)
             except Exception as e:
                 logger.error(f"❌ Error in monitoring loop: {e}")
-                await asyncio.sleep(15)
+                await self._wait_for_stop(15)
     
     async def _daily_report_loop(self):
         """Posts daily report at midnight UTC"""
         while self.running:
             try:
                 # Calculate time until next midnight UTC
-                now = datetime.utcnow()
+                now = datetime.now(timezone.utc)
                 tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
                 seconds_until_midnight = (tomorrow - now).total_seconds()
                 
-                # Wait until midnight
-                await asyncio.sleep(seconds_until_midnight)
+                # Wait until midnight (returns immediately on stop)
+                if await self._wait_for_stop(seconds_until_midnight):
+                    return
                 
                 # Post daily report
                 await self.post_daily_report()
                 
             except Exception as e:
                 logger.error(f"❌ Error in daily report loop: {e}")
-                await asyncio.sleep(3600)  # Try again in an hour
+                await self._wait_for_stop(3600)  # Try again in an hour
     
     async def _check_all_signals(self, cycle: int = 0):
         """Check performance of all active signals.
@@ -133,43 +262,116 @@ class PerformanceTracker:
         Older signals checked every 4th cycle (~60s)."""
         try:
             signals = await self._get_active_signals()
-            now = datetime.utcnow()
+            await self._refresh_tracked_tokens(signals)
+            now = datetime.now(timezone.utc).replace(tzinfo=None)  # created_at is naive UTC
 
+            due = []
             for signal in signals:
                 age = now - signal['created_at']
                 is_fresh = age.total_seconds() < 3600  # < 1 hour old
 
                 if is_fresh or cycle % 4 == 0:
-                    await self._check_signal_performance(signal)
+                    due.append(signal)
+
+            # One batched DexScreener lookup for every post-grad signal due this cycle
+            post_grad = [s['token_address'] for s in due if s.get('signal_type', 'POST_GRADUATION') != 'PRE_GRADUATION']
+            dex_prices = await self._get_dexscreener_prices_batch(post_grad) if post_grad else {}
+
+            # Overlap the remaining per-signal lookups (pump.fun / graduation fallback)
+            async def check_bounded(signal: Dict):
+                async with self.check_sem:
+                    return await self._check_signal_performance(signal, dex_prices)
+
+            results = await asyncio.gather(*(check_bounded(s) for s in due), return_exceptions=True)
+
+            updates = []
+            for signal, result in zip(due, results):
+                if isinstance(result, Exception):
+                    logger.error(f"❌ Error checking performance for {signal.get('token_symbol')}: {result}")
+                elif result:
+                    updates.append(result)
+
+            if not updates:
+                return
+
+            # One transaction for every price, milestone and graduation write this cycle
+            await self.db.apply_signal_updates(
+                price_rows=[(u.signal['token_address'], u.current_price) for u in updates],
+                milestone_rows=[
+                    (u.signal['token_address'], milestone, u.current_price)
+                    for u in updates for milestone in u.milestones_hit
+                ],
+                graduated=[u.signal['token_address'] for u in updates if u.graduated]
+            )
+
+            # Post to Telegram only the highest key threshold crossed per signal
+            # (milestones_hit is highest first) - collected so a burst goes out as one post
+            milestone_events = []
+            for update in updates:
+                for milestone in update.milestones_hit:
+                    if milestone in config.MILESTONE_POST_THRESHOLDS:
+                        milestone_events.append(
+                            (update.signal, milestone, update.current_price, update.multiple, update.signal_type)
+                        )
+                        break
+                    logger.debug(f"   📊 {milestone}x recorded (no TG post)")
+
+            if len(milestone_events) == 1:
+                await self._post_milestone_update(*milestone_events[0])
+            elif milestone_events:
+                await self._post_milestone_batch(milestone_events)
 
         except Exception as e:
             logger.error(f"❌ Error checking signals: {e}")
     
-    async def _get_active_signals(self) -> List[Dict]:
-        """Get signals that are still being tracked (posted in last 24 hours)"""
+    async def _get_active_signals(self) -> List[asyncpg.Record]:
+        """Get signals that are still being tracked (posted in last 24 hours)
+
+        Only the columns the tracker reads are selected; records are returned
+        as-is since asyncpg Records support both signal['x'] and signal.get('x').
+        """
         async with self.db.pool.acquire() as conn:
-            rows = await conn.fetch('''
-                SELECT s.*, 
-                       COALESCE(MAX(p.milestone), 0) as max_milestone_reached
+            return await conn.fetch('''
+                SELECT s.token_address,
+                       s.token_symbol,
+                       s.signal_type,
+                       s.entry_price,
+                       s.current_price,
+                       s.created_at,
+                       mp.max_milestone_reached,
+                       (SELECT MIN(m) FROM unnest($1::real[]) AS m
+                        WHERE m > mp.max_milestone_reached) as next_milestone
                 FROM signals s
-                LEFT JOIN performance p ON s.token_address = p.token_address
+                CROSS JOIN LATERAL (
+                    -- Per-signal lookup on the UNIQUE (token_address, milestone) index
+                    SELECT COALESCE(MAX(p.milestone), 0) as max_milestone_reached
+                    FROM performance p
+                    WHERE p.token_address = s.token_address
+                ) mp
                 WHERE s.signal_posted = TRUE
                 AND s.created_at > NOW() - INTERVAL '24 hours'
-                GROUP BY s.id
-                HAVING COALESCE(MAX(p.milestone), 0) < 100
+                AND mp.max_milestone_reached < 100
                 ORDER BY s.created_at DESC
-            ''')
-            return [dict(row) for row in rows]
+            ''', MILESTONE_PARAM)
     
-    async def _check_signal_performance(self, signal: Dict):
-        """Check current price and detect milestone hits"""
+    async def _check_signal_performance(self, signal: Dict, dex_prices: Dict[str, float] = None) -> Optional[SignalUpdate]:
+        """Check current price and detect milestone hits
+
+        dex_prices: prefetched DexScreener prices for post-grad tokens (from
+        _get_dexscreener_prices_batch); fetched individually if not given.
+
+        Doesn't write anything - returns a SignalUpdate (or None if no price, or
+        the price hasn't moved since the last stored one) for _check_all_signals
+        to persist in one batch.
+        """
         try:
             token_address = signal['token_address']
             entry_price = signal['entry_price']
             signal_type = signal.get('signal_type', 'POST_GRADUATION')
+            graduated = False
             
             if not entry_price or entry_price == 0:
-                return
+                return None
             
             # Get current price based on signal type
             if signal_type == 'PRE_GRADUATION':
@@ -183,70 +385,172 @@ class PerformanceTracker:
                     if current_price:
                         # Token graduated! Update signal type
                         logger.info(f"🎓 {signal['token_symbol']} graduated - switching to DexScreener tracking")
-                        await self._update_signal_type(token_address, 'POST_GRADUATION')
+                        graduated = True
                         signal_type = 'POST_GRADUATION'
                 
                 if not current_price:
-                    return
+                    return None
                     
                 logger.debug(f"📊 Pre-grad tracking: {signal['token_symbol']} at ${current_price:.8f}")
                 
             else:  # POST_GRADUATION
                 # Token graduated to Raydium - use DexScreener
-                current_price = await self._get_dexscreener_price(token_address)
+                if dex_prices is not None:
+                    current_price = dex_prices.get(token_address)
+                else:
+                    current_price = await self._get_dexscreener_price(token_address)
                 
                 if not current_price:
-                    return
+                    return None
                     
                 logger.debug(f"📊 Post-grad tracking: {signal['token_symbol']} at ${current_price:.8f}")
             
-            # Update current price in database
-            await self.db.update_price(token_address, current_price)
+            # Quiet token: same price as last stored, so milestones were already checked
+            prev_price = signal.get('current_price')
+            if not graduated and prev_price and abs(prev_price - current_price) / prev_price < PRICE_UNCHANGED_TOLERANCE:
+                return None
             
             # Calculate current multiple
             multiple = current_price / entry_price
             
-            # Check for milestone hits
+            # Check for milestone hits (all are saved to the database)
+            # next_milestone comes from SQL, so most checks are a single comparison
             max_milestone_reached = signal.get('max_milestone_reached', 0)
+            next_milestone = signal.get('next_milestone')
+            milestones_hit = []
             
-            for milestone in MILESTONES:
-                if multiple >= milestone and milestone > max_milestone_reached:
-                    # New milestone reached!
-                    logger.info(f"🎯 {signal['token_symbol']} hit {milestone}x milestone!")
-
-                    # Save to database (all milestones)
-                    await self.db.insert_milestone(token_address, milestone, current_price)
-
-                    # Post to Telegram only for key thresholds
-                    if milestone in config.MILESTONE_POST_THRESHOLDS:
-                        await self._post_milestone_update(signal, milestone, current_price, multiple, signal_type)
-                    else:
-                        logger.debug(f"   📊 {milestone}x recorded (no TG post)")
+            if next_milestone is not None and multiple >= next_milestone:
+                # Highest first; everything at or below max_milestone_reached is already stored
+                for milestone in MILESTONES_DESC:
+                    if milestone <= max_milestone_reached:
+                        break
+                    if multiple >= milestone:
+                        milestones_hit.append(milestone)
+                if milestones_hit:
+                    logger.info(f"🎯 {signal['token_symbol']} hit {milestones_hit[0]}x milestone!")
+
+            return SignalUpdate(
+                signal=signal,
+                signal_type=signal_type,
+                current_price=current_price,
+                multiple=multiple,
+                milestones_hit=milestones_hit,
+                graduated=graduated
+            )
                     
         except Exception as e:
             logger.error(f"❌ Error checking performance for {signal.get('token_symbol')}: {e}")
+            return None
     
+    def _cached_price(self, source: str, token_address: str) -> Optional[float]:
+        """Return a cached HTTP price if it's younger than PRICE_CACHE_TTL"""
+        key = (source, token_address)
+        entry = self._price_cache.get(key)
+        if entry and time.monotonic() - entry[1] < PRICE_CACHE_TTL:
+            self._price_cache.move_to_end(key)
+            return entry[0]
+        return None
+
+    def _store_price(self, source: str, token_address: str, price: float):
+        """Cache a freshly fetched price, evicting least recently used entries"""
+        key = (source, token_address)
+        self._price_cache[key] = (price, time.monotonic())
+        self._price_cache.move_to_end(key)
+        while len(self._price_cache) > PRICE_CACHE_MAX:
+            self._price_cache.popitem(last=False)
+
+    @staticmethod
+    def _pair_liquidity(pair: Dict) -> float:
+        """USD liquidity of a DexScreener pair (0 if missing)"""
+        return (pair.get('liquidity') or {}).get('usd') or 0
+
     async def _get_dexscreener_price(self, token_address: str) -> float:
         """Get current price from DexScreener (for post-graduation tokens)"""
+        cached = self._cached_price('dexscreener', token_address)
+        if cached is not None:
+            return cached
+
         try:
             url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
             
-            async with self.session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    pairs = data.get('pairs', [])
-                    if pairs:
-                        # Get the most liquid pair
-                        pair = pairs[0]
-                        price = float(pair.get('priceUsd', 0))
-                        return price
+            async with self.session.get(url) as response:
+                data = orjson.loads(await response.read())
+            
+            pairs = data.get('pairs') or []
+            if pairs:
+                # DexScreener doesn't order pairs by liquidity
+                pair = max(pairs, key=self._pair_liquidity)
+                price = float(pair.get('priceUsd') or 0)
+                if price:
+                    self._store_price('dexscreener', token_address, price)
+                return price
                     
+        except aiohttp.ClientResponseError as e:
+            logger.debug(f"DexScreener HTTP {e.status} for {token_address[:8]}")
         except Exception as e:
             logger.debug(f"Error fetching DexScreener price for {token_address[:8]}: {e}")
         
         return None
     
+    async def _get_dexscreener_prices_batch(self, token_addresses: List[str]) -> Dict[str, float]:
+        """
+        Get current prices for many tokens from DexScreener (post-graduation)
+
+        Uses the multi-token endpoint, 30 addresses per request, with the chunks
+        fetched concurrently. Returns {token_address: price_usd}, using the most
+        liquid pair per token; tokens without pairs are omitted. Prices cached
+        within PRICE_CACHE_TTL aren't refetched.
+        """
+        prices = {}
+        to_fetch = []
+        for address in token_addresses:
+            cached = self._cached_price('dexscreener', address)
+            if cached is not None:
+                prices[address] = cached
+            else:
+                to_fetch.append(address)
+
+        if not to_fetch:
+            return prices
+
+        chunks = [
+            to_fetch[i:i + DEXSCREENER_BATCH_SIZE]
+            for i in range(0, len(to_fetch), DEXSCREENER_BATCH_SIZE)
+        ]
+
+        async def fetch_chunk(chunk: List[str]) -> List[Dict]:
+            try:
+                url = f"https://api.dexscreener.com/latest/dex/tokens/{','.join(chunk)}"
+                async with self.session.get(url) as response:
+                    data = orjson.loads(await response.read())
+                return data.get('pairs') or []
+            except aiohttp.ClientResponseError as e:
+                logger.debug(f"DexScreener batch HTTP {e.status} ({len(chunk)} tokens)")
+            except Exception as e:
+                logger.debug(f"Error fetching DexScreener batch ({len(chunk)} tokens): {e}")
+            return []
+
+        results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+
+        # Keep the highest-liquidity pair per base token
+        wanted = set(to_fetch)
+        best = {}
+        for pairs in results:
+            for pair in pairs:
+                address = (pair.get('baseToken') or {}).get('address')
+                if address not in wanted:
+                    continue
+                liquidity = self._pair_liquidity(pair)
+                if address not in best or liquidity > best[address][0]:
+                    best[address] = (liquidity, pair)
+
+        for address, (_, pair) in best.items():
+            price = float(pair.get('priceUsd') or 0)
+            if price:
+                prices[address] = price
+                self._store_price('dexscreener', address, price)
+        return prices
+
     async def _get_pumpfun_price(self, token_address: str) -> float:
         """
         Get current price for pre-graduation token
@@ -256,31 +560,28 @@ class PerformanceTracker:
         if token_address in self.pumpportal_prices:
             return self.pumpportal_prices[token_address]
         
-        # Fallback: query PumpPortal API directly
+        # Fallback: query PumpPortal API directly (short-lived cache in front)
+        cached = self._cached_price('pumpportal', token_address)
+        if cached is not None:
+            return cached
+
         try:
             # PumpPortal has endpoints for token data
             url = f"https://pumpportal.fun/api/data/token/{token_address}"
             
-            async with self.session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    price = data.get('priceUsd', 0)
-                    if price:
-                        return float(price)
+            async with self.session.get(url) as response:
+                data = orjson.loads(await response.read())
+            price = data.get('priceUsd', 0)
+            if price:
+                self._store_price('pumpportal', token_address, float(price))
+                return float(price)
+        except aiohttp.ClientResponseError as e:
+            logger.debug(f"PumpPortal HTTP {e.status} for {token_address[:8]}")
         except Exception as e:
             logger.debug(f"Error fetching pump.fun price for {token_address[:8]}: {e}")
         
         return None
     
-    async def _update_signal_type(self, token_address: str, new_type: str):
-        """Update signal type when token graduates"""
-        async with self.db.pool.acquire() as conn:
-            await conn.execute('''
-                UPDATE signals
-                SET signal_type = $1
-                WHERE token_address = $2
-            ''', new_type, token_address)
-    
     def _get_milestone_banner(self, milestone: float) -> str:
         """Get the right video banner file_id for this milestone tier.
         Falls back to main signal banner if tier-specific not set."""
@@ -295,31 +596,62 @@ class PerformanceTracker:
         # Fall back to main signal banner
         return config.TELEGRAM_BANNER_FILE_ID
 
+    def _format_milestone_message(self, signal: Dict, milestone: float, current_price: float, multiple: float) -> str:
+        """Build the milestone caption from MILESTONE_TEMPLATE"""
+        # Calculate time since signal
+        time_since = datetime.now(timezone.utc).replace(tzinfo=None) - signal['created_at']
+        hours, remainder = divmod(int(time_since.total_seconds()), 3600)
+
+        return MILESTONE_TEMPLATE.format(
+            milestone=int(milestone),
+            symbol=signal['token_symbol'],
+            entry_price=signal['entry_price'],
+            current_price=current_price,
+            gain_pct=(multiple - 1) * 100,
+            hours=hours,
+            minutes=remainder // 60,
+            token_address=signal['token_address']
+        )
+
+    async def _post_milestone_batch(self, events: List[tuple]):
+        """
+        Post several milestone hits as one combined text message
+
+        events: (signal, milestone, current_price, multiple, signal_type) tuples.
+        Blocks are split across messages only if they'd exceed Telegram's limit.
+        """
+        try:
+            header = f"\U0001f3af <b>MULTIPLE MILESTONES</b> ({len(events)})\n\n"
+            separator = "\n---\n"
+
+            messages = []
+            current = header
+            for signal, milestone, current_price, multiple, _ in events:
+                block = self._format_milestone_message(signal, milestone, current_price, multiple)
+                if current != header and len(current) + len(separator) + len(block) > TELEGRAM_MAX_MESSAGE_LENGTH:
+                    messages.append(current)
+                    current = header
+                current += block if current == header else separator + block
+            messages.append(current)
+
+            for message in messages:
+                await self.telegram.bot.send_message(
+                    chat_id=self.telegram.channel_id,
+                    text=message,
+                    parse_mode='HTML',
+                    disable_web_page_preview=True
+                )
+
+            logger.info(f"\U0001f4e4 Milestone updates posted: {len(events)} hits in {len(messages)} message(s)")
+
+        except Exception as e:
+            logger.error(f"\u274c Failed to post milestone updates: {e}")
+
     async def _post_milestone_update(self, signal: Dict, milestone: float, current_price: float, multiple: float, signal_type: str):
         """Post milestone update to Telegram with tier-based video banner"""
         try:
             symbol = signal['token_symbol']
-            token_address = signal['token_address']
-            entry_price = signal['entry_price']
-
-            # Calculate time since signal
-            time_since = datetime.utcnow() - signal['created_at']
-            hours = int(time_since.total_seconds() / 3600)
-            minutes = int((time_since.total_seconds() % 3600) / 60)
-
-            gain_pct = (multiple - 1) * 100
-
-            # Build compact caption (fits 1024 char video caption limit)
-            message = f"\U0001f525 <b>PROMETHEUS | {int(milestone)}x</b>\n\n"
-            message += f"<b>${symbol}</b> hit <b>{int(milestone)}x</b>\n\n"
-            message += f"\U0001f4b0 Entry: ${entry_price:.8f}\n"
-            message += f"\U0001f48e Current: ${current_price:.8f}\n"
-            message += f"\U0001f4c8 Gain: <b>+{gain_pct:.1f}%</b>\n"
-            message += f"\u23f1\ufe0f Time: {hours}h {minutes}m\n\n"
-            message += f'<a href="https://dexscreener.com/solana/{token_address}">DexS</a>'
-            message += f' | <a href="https://birdeye.so/token/{token_address}">Bird</a>'
-            message += f' | <a href="https://pump.fun/{token_address}">Pump</a>\n\n'
-            message += f"<code>{token_address}</code>"
+            message = self._format_milestone_message(signal, milestone, current_price, multiple)
 
             # Try video banner first, fall back to text
             banner_id = self._get_milestone_banner(milestone)
@@ -358,58 +690,34 @@ class PerformanceTracker:
         try:
             logger.info("📊 Generating daily report...")
             
-            # Get today's signals
-            signals = await self.db.get_signals_today()
+            # Today's stats aggregated in SQL
+            stats = await self.db.get_daily_stats()
+            total_signals = stats['total_signals']
             
-            if not signals:
+            if not total_signals:
                 logger.info("No signals posted today, skipping daily report")
                 return
             
-            # Calculate stats
-            total_signals = len(signals)
-            
-            # Get performance for each signal
-            signal_performance = []
-            for signal in signals:
-                current_price = signal.get('current_price')
-                entry_price = signal.get('entry_price')
-                
-                if current_price and entry_price and entry_price > 0:
-                    multiple = current_price / entry_price
-                    gain_pct = (multiple - 1) * 100
-                    
-                    signal_performance.append({
-                        'symbol': signal['token_symbol'],
-                        'signal_type': signal['signal_type'],
-                        'multiple': multiple,
-                        'gain_pct': gain_pct,
-                        'conviction': signal['conviction_score']
-                    })
-            
-            # Sort by gain
-            signal_performance.sort(key=lambda x: x['gain_pct'], reverse=True)
-            
-            # Calculate win rate (2x+ is a real win)
-            winners = [s for s in signal_performance if s['multiple'] >= 2.0]
-            flat = [s for s in signal_performance if 1.0 <= s['multiple'] < 2.0]
-            win_rate = (len(winners) / len(signal_performance) * 100) if signal_performance else 0
-            
-            # Calculate average gain
-            avg_gain = sum(s['gain_pct'] for s in signal_performance) / len(signal_performance) if signal_performance else 0
+            # Win rate: 2x+ is a real win
+            priced = stats['priced']
+            winners = stats['winners']
+            flat = stats['flat']
+            win_rate = (winners / priced * 100) if priced else 0
+            avg_gain = stats['avg_gain']
             
             # Get top 10
-            top_10 = signal_performance[:10]
+            top_10 = await self.db.get_top_signals_today(10)
             
             # Build message
             message = f"""📊 <b>DAILY PERFORMANCE REPORT</b>
 
-📅 {datetime.utcnow().strftime('%B %d, %Y')}
+📅 {datetime.now(timezone.utc).strftime('%B %d, %Y')}
 
 📈 <b>Overview:</b>
 🔔 Total Signals: {total_signals}
-✅ Winners (2x+): {len(winners)}
-🟡 Flat: {len(flat)}
-❌ Losers: {len(signal_performance) - len(winners) - len(flat)}
+✅ Winners (2x+): {winners}
+🟡 Flat: {flat}
+❌ Losers: {priced - winners - flat}
 📊 Win Rate: <b>{win_rate:.1f}%</b>
 💰 Avg Gain: <b>{avg_gain:+.1f}%</b>
 
@@ -420,9 +728,9 @@ class PerformanceTracker:
                 emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
                 signal_emoji = "⚡" if perf['signal_type'] == 'PRE_GRADUATION' else "🎓"
                 
-                message += f"\n{emoji} ${perf['symbol']} {signal_emoji}\n"
-                message += f"   Gain: <b>{perf['gain_pct']:+.1f}%</b> ({perf['multiple']:.2f}x)\n"
-                message += f"   Conviction: {perf['conviction']}/100\n"
+                message += f"\n{emoji} ${perf['token_symbol']} {signal_emoji}\n"
+                message += f"   Gain: <b>{(perf['multiple'] - 1) * 100:+.1f}%</b> ({perf['multiple']:.2f}x)\n"
+                message += f"   Conviction: {perf['conviction_score']}/100\n"
             
             message += "\n⚡ = Pre-graduation signal (40-60%)\n"
             message += "🎓 = Post-graduation signal (100%)\n\n"
@@ -453,32 +761,17 @@ class PerformanceTracker:
     async def get_stats(self) -> Dict:
         """Get current performance stats (for admin commands)"""
         try:
-            # Get today's signals
-            signals = await self.db.get_signals_today()
-            
-            # Calculate quick stats
-            total = len(signals)
-            
-            signal_performance = []
-            for signal in signals:
-                entry_price = signal.get('entry_price')
-                peak_price = signal.get('max_price_reached') or signal.get('current_price')
-
-                if peak_price and entry_price and entry_price > 0:
-                    multiple = peak_price / entry_price
-                    gain_pct = (multiple - 1) * 100
-                    signal_performance.append({'multiple': multiple, 'gain_pct': gain_pct})
-
-            winners = len([s for s in signal_performance if s['multiple'] >= 2.0])
-            win_rate = (winners / len(signal_performance) * 100) if signal_performance else 0
-            avg_gain = sum(s['gain_pct'] for s in signal_performance) / len(signal_performance) if signal_performance else 0
+            # Peak-price stats for today's signals, aggregated in SQL
+            stats = await self.db.get_daily_stats(use_peak_price=True)
+            priced = stats['priced']
+            winners = stats['winners']
 
             return {
-                'total_signals': total,
+                'total_signals': stats['total_signals'],
                 'winners': winners,
-                'losers': len(signal_performance) - winners,
-                'win_rate': win_rate,
-                'avg_gain': avg_gain
+                'losers': priced - winners,
+                'win_rate': (winners / priced * 100) if priced else 0,
+                'avg_gain': stats['avg_gain']
             }
             
         except Exception as e:
@@ -495,10 +788,10 @@ class PerformanceTracker:
         while self.running:
             try:
                 await self._determine_outcomes()
-                await asyncio.sleep(3600)  # Check every hour
+                await self._wait_for_stop(3600)  # Check every hour
             except Exception as e:
                 logger.error(f"❌ Error in outcome tracking loop: {e}")
-                await asyncio.sleep(3600)
+                await self._wait_for_stop(3600)
 
     async def _determine_outcomes(self):
         """
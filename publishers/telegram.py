@@ -7,7 +7,9 @@ from loguru import logger
 from telegram import Bot
 from telegram.error import TelegramError
 from telegram.constants import ParseMode
+import aiohttp
 import asyncio
+import os
 import config
 
 
@@ -571,26 +573,37 @@ The fire has been stolen. Watching for elite trader activity... 🔥"""
             return None
 
         try:
+            # Post the multipart body via aiohttp so the file is streamed in chunks
+            # (python-telegram-bot reads the whole file into memory first)
+            url = f"https://api.telegram.org/bot{self.bot.token}/sendVideo"
             with open(banner_path, 'rb') as f:
-                result = await self.bot.send_video(
-                    chat_id=self.channel_id,
-                    video=f,
-                    caption="🎨 Banner uploaded! Saving file_id...",
-                    supports_streaming=True
-                )
-
-                file_id = result.video.file_id
-                logger.info(f"✅ Banner uploaded successfully!")
-                logger.info(f"📝 Set this environment variable:")
-                logger.info(f'TELEGRAM_BANNER_FILE_ID={file_id}')
-
-                # Delete the test message
-                await self.bot.delete_message(
-                    chat_id=self.channel_id,
-                    message_id=result.message_id
-                )
-
-                return file_id
+                form = aiohttp.FormData()
+                form.add_field('chat_id', str(self.channel_id))
+                form.add_field('caption', "🎨 Banner uploaded! Saving file_id...")
+                form.add_field('supports_streaming', 'true')
+                form.add_field('video', f, filename=os.path.basename(banner_path))
+
+                async with aiohttp.ClientSession() as session:
+                    async with session.post(url, data=form, timeout=aiohttp.ClientTimeout(total=120)) as resp:
+                        data = await resp.json()
+
+            if not data.get('ok'):
+                logger.error(f"❌ Failed to upload banner: {data.get('description')}")
+                return None
+
+            result = data['result']
+            file_id = result['video']['file_id']
+            logger.info(f"✅ Banner uploaded successfully!")
+            logger.info(f"📝 Set this environment variable:")
+            logger.info(f'TELEGRAM_BANNER_FILE_ID={file_id}')
+
+            # Delete the test message
+            await self.bot.delete_message(
+                chat_id=self.channel_id,
+                message_id=result['message_id']
+            )
+
+            return file_id
 
         except FileNotFoundError:
             logger.error(f"❌ Banner file not found: {banner_path}")
@@ -35,7 +35,10 @@ async def main():
     # Run collector
     collector = HistoricalDataCollector()
     await collector.initialize()
-    await collector.collect_all(target_count=150)
+    try:
+        await collector.collect_all(target_count=150)
+    finally:
+        await collector.close()
 
     logger.info("\n" + "=" * 80)
     logger.info("✅ COMPLETE - Data ready for ML training!")
@@ -168,7 +168,7 @@ class ConvictionEngine:
             # 2. Narrative Detection (0-7 points) - if enabled (100-point budget)
             narrative_data = {}  # Track for Telegram display
             if self.narrative_detector and config.ENABLE_NARRATIVES:
-                narrative_data = self.narrative_detector.analyze_token(
+                narrative_data = await self.narrative_detector.analyze_token_async(
                     token_symbol,
                     token_name,
                     token_data.get('description', '')
@@ -16,6 +16,7 @@ Run via cron: 0 0 * * * /path/to/daily_token_collector.py
 import asyncio
 import aiohttp
 import json
+import orjson
 import os
 import sys
 from datetime import datetime, timedelta
@@ -30,7 +31,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
 from database import Database
-from tools.historical_data_collector import HistoricalDataCollector
+from tools.historical_data_collector import HistoricalDataCollector, WIN_OUTCOMES
 from tools.enhanced_token_analyzer import EnhancedTokenAnalyzer
 
 
@@ -122,7 +123,8 @@ class DailyTokenCollector:
                     logger.warning(f"   Failed: HTTP {resp.status}")
                     return
 
-                data = await resp.json()
+                # orjson parses the raw bytes directly (no bytes -> str decode pass)
+                data = orjson.loads(await resp.read())
 
                 # Extract tokens from response
                 if isinstance(data, list):
@@ -290,9 +292,9 @@ class DailyTokenCollector:
                 token['whale_count'] = len(whales)
 
                 # Track whales
-                if token['outcome'] in ['100x+', '50x', '10x']:
+                if token['outcome'] in WIN_OUTCOMES:
                     for whale in whales:
-                        self.collector.whale_wallets[whale]['win_count'] += 1
+                        self.collector.whale_wallets[whale].win_count += 1
 
                 await asyncio.sleep(1.5)  # Rate limit
 
@@ -339,14 +341,7 @@ class DailyTokenCollector:
             # Mark all as "early_whale" since we're looking at tokens post-pump
             # These holders likely bought early since they're still holding
             for whale in whales:
-                if whale not in self.collector.whale_wallets:
-                    self.collector.whale_wallets[whale] = {
-                        'tokens_bought': [],
-                        'win_count': 0,
-                        'total_invested': 0
-                    }
-
-                self.collector.whale_wallets[whale]['tokens_bought'].append({
+                self.collector.whale_wallets[whale].tokens_bought.append({
                     'token_symbol': token_symbol,
                     'token_address': token_address,
                     'early_buyer': True,  # Assume early since still holding after pump
@@ -396,16 +391,16 @@ class DailyTokenCollector:
         # Analyze and save successful whales
         successful_whales = []
         for wallet, data in self.collector.whale_wallets.items():
-            token_count = len(data['tokens_bought'])
+            token_count = len(data.tokens_bought)
             if token_count >= 2:
-                win_rate = (data['win_count'] / token_count) if token_count > 0 else 0
+                win_rate = (data.win_count / token_count) if token_count > 0 else 0
                 if win_rate >= 0.5:
                     successful_whales.append({
                         'address': wallet,
                         'tokens_bought_count': token_count,
-                        'wins': data['win_count'],
+                        'wins': data.win_count,
                         'win_rate': win_rate,
-                        'tokens': data['tokens_bought']
+                        'tokens': data.tokens_bought
                     })
 
         if successful_whales:
@@ -448,7 +443,10 @@ class DailyTokenCollector:
 async def main():
     """Run daily collection"""
     collector = DailyTokenCollector()
-    await collector.collect_daily()
+    try:
+        await collector.collect_daily()
+    finally:
+        await collector.collector.close()
 
 
 if __name__ == "__main__":
@@ -15,12 +15,16 @@ Cost: ~3,000 CU (40K/day free tier = plenty of headroom)
 """
 import asyncio
 import aiohttp
-import json
+import io
+import numpy as np
+import orjson
 import os
 import sys
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from loguru import logger
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 # Add parent to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -28,6 +32,98 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 from database import Database
 
+# Optional: stream large listing payloads item by item
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Outcomes that count as a "win" when scoring whale wallets
+WIN_OUTCOMES = frozenset({'100x+', '50x', '10x'})
+
+# How long a failed DexScreener lookup is remembered before retrying (seconds)
+DEX_MISS_TTL = 300
+
+# Max concurrent DexScreener requests / Helius RPC requests
+DEX_CONCURRENCY = 10
+RPC_CONCURRENCY = 5
+
+# Retries for HTTP 429 / 5xx / connection errors (backoff: 0.5s, 1s, 2s)
+MAX_RETRIES = 3
+RETRY_BACKOFF_BASE = 0.5
+
+# Credits charged per standard Helius RPC call (getTokenLargestAccounts, getAccountInfo)
+RPC_CU_PER_CALL = 1
+
+
+@dataclass(slots=True)
+class WhaleStats:
+    """Per-wallet whale tracking across collected tokens"""
+    tokens_bought: list = field(default_factory=list)
+    win_count: int = 0
+    total_invested: float = 0
+
+
+def _iter_listing(raw: bytes):
+    """
+    Yield token entries from a DexScreener listing payload
+
+    Top-level arrays (token-boosts / token-profiles) are streamed with ijson when
+    available, so the full list of dicts is never materialized.
+    """
+    if IJSON_AVAILABLE and raw[:64].lstrip()[:1] == b'[':
+        yield from ijson.items(io.BytesIO(raw), 'item')
+        return
+
+    data = orjson.loads(raw)
+    yield from (data if isinstance(data, list) else data.get('tokens', []))
+
+
+def _retry_after_seconds(header_value: str, attempt: int) -> float:
+    """Parse a Retry-After header (seconds form), falling back to exponential backoff"""
+    try:
+        return max(float(header_value), 0)
+    except (TypeError, ValueError):
+        return RETRY_BACKOFF_BASE * 2 ** attempt
+
+
+def _read_json(path: str) -> dict:
+    """Read and parse JSON (blocking - run via asyncio.to_thread)"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def _write_json(path: str, data: dict):
+    """
+    Serialize and write JSON (blocking - run via asyncio.to_thread)
+
+    Top-level list values (tokens, whales) are written one item at a time so the
+    whole dataset is never encoded into a single buffer. Output goes to a temp
+    file first, so a crash mid-write leaves the previous file intact.
+    """
+    opts = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, 'wb') as f:
+        f.write(b'{')
+        for idx, (key, value) in enumerate(data.items()):
+            f.write(b',\n  ' if idx else b'\n  ')
+            f.write(orjson.dumps(key, option=opts) + b': ')
+
+            # JSON strings never contain raw newlines, so re-indenting by replace is safe
+            if isinstance(value, list):
+                f.write(b'[')
+                for item_idx, item in enumerate(value):
+                    f.write(b',\n    ' if item_idx else b'\n    ')
+                    f.write(orjson.dumps(item, option=opts).replace(b'\n', b'\n    '))
+                f.write(b'\n  ]' if value else b']')
+            else:
+                f.write(orjson.dumps(value, option=opts).replace(b'\n', b'\n  '))
+        f.write(b'\n}\n')
+
+    os.replace(tmp_path, path)
+
 
 class HistoricalDataCollector:
     """Collects historical data for ML training"""
@@ -49,15 +145,41 @@ class HistoricalDataCollector:
         self.helius_rpc_url = f"https://mainnet.helius-rpc.com/?api-key={self.helius_api_key}" if self.helius_api_key else None
 
         self.db = None
+        self.session = None
         self.collected_tokens = []
-        self.whale_wallets = defaultdict(lambda: {"tokens_bought": [], "win_count": 0, "total_invested": 0})
+        self.whale_wallets = defaultdict(WhaleStats)
         self.total_cu_used = 0
+        self._cu_lock = asyncio.Lock()
+
+        # Bound in-flight requests per API (replaces fixed sleeps between calls)
+        self.dex_sem = asyncio.Semaphore(DEX_CONCURRENCY)
+        self.rpc_sem = asyncio.Semaphore(RPC_CONCURRENCY)
+
+        # Per-run DexScreener cache: address -> token data, address -> time of last failed lookup
+        self._dex_cache = {}
+        self._dex_misses = {}
 
         # For incremental collection: set of already collected token addresses
         self.existing_tokens = set()
 
     async def initialize(self):
-        """Initialize database (optional - only needed for saving whales to DB)"""
+        """Initialize HTTP session and database (DB optional - only needed for saving whales)"""
+        # One session for the whole run so connections are reused across tokens
+        # Per-host cap matches DEX_CONCURRENCY so concurrent fetches can never
+        # fan out into more sockets than DexScreener/Helius will tolerate
+        connector = aiohttp.TCPConnector(
+            limit=50,
+            limit_per_host=DEX_CONCURRENCY,
+            ttl_dns_cache=600,
+            keepalive_timeout=30,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            trust_env=True
+        )
+
         try:
             self.db = Database()
             await self.db.connect()
@@ -67,6 +189,41 @@ class HistoricalDataCollector:
             logger.info("   Collector will still work - output saved to JSON files only")
             self.db = None
 
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def _add_cu(self, units: int):
+        """Record API credits spent (lock-guarded so concurrent extractions stay accurate)"""
+        async with self._cu_lock:
+            self.total_cu_used += units
+
+    async def _request_with_retry(self, session: aiohttp.ClientSession, method: str, url: str, **kwargs) -> tuple:
+        """
+        Send a request, retrying rate limits and transient failures
+
+        429 responses wait for Retry-After; 5xx responses and connection errors back
+        off exponentially. Returns (status, body) of the final response.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with session.request(method, url, **kwargs) as resp:
+                    if resp.status == 429 and attempt < MAX_RETRIES:
+                        delay = _retry_after_seconds(resp.headers.get('Retry-After'), attempt)
+                    elif resp.status >= 500 and attempt < MAX_RETRIES:
+                        delay = RETRY_BACKOFF_BASE * 2 ** attempt
+                    else:
+                        return resp.status, await resp.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = RETRY_BACKOFF_BASE * 2 ** attempt
+
+            logger.debug(f"   Retrying {url.split('?')[0]} in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+            await asyncio.sleep(delay)
+
     async def scan_moralis_for_pumpfun_graduates(self, min_mcap: int = 1000000, max_mcap: int = 100000000, limit: int = 150) -> list:
         """
         Use Moralis to find pump.fun tokens that started at 20-30K and ran to millions
@@ -138,86 +295,80 @@ class HistoricalDataCollector:
             "https://api.dexscreener.com/token-profiles/latest/v1",
         ]
 
-        collected_addresses = set()
-        tokens_data = []
-
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            # Try each strategy
-            for idx, url in enumerate(search_strategies, 1):
-                if len(collected_addresses) >= limit:
+        # Step 1: gather candidate addresses from every source, deduped before any token lookup
+        seen_addresses = set(self.existing_tokens)
+        candidates = []
+
+        session = self.session
+
+        # Try each strategy
+        for idx, url in enumerate(search_strategies, 1):
+            logger.info(f"📊 Strategy {idx}: Fetching from DexScreener...")
+
+            try:
+                status, raw = await self._request_with_retry(session, 'GET', url, timeout=aiohttp.ClientTimeout(total=30))
+                if status != 200:
+                    logger.warning(f"   Failed: HTTP {status}")
+                    continue
+
+                # Filter by chain and dedupe using the listing payload only,
+                # so no HTTP request is spent on non-Solana or already-seen tokens
+                listed = 0
+                added = 0
+                for token in _iter_listing(raw):
+                    listed += 1
+
+                    # Check if it's from pump.fun / Raydium
+                    if token.get('chainId') != 'solana':
+                        continue
+
+                    # Skips tokens already collected (incremental mode) too
+                    token_address = token.get('tokenAddress') or token.get('address')
+                    if not token_address or token_address in seen_addresses:
+                        continue
+
+                    seen_addresses.add(token_address)
+                    candidates.append(token_address)
+                    added += 1
+
+                logger.info(f"   Got {listed} tokens from API ({added} new Solana candidates)")
+
+            except Exception as e:
+                logger.error(f"   Error with strategy {idx}: {e}")
+
+        # Known successful tokens top up the list if discovery falls short
+        known_tokens = []
+        for token in await self.load_known_tokens():
+            if token['address'] not in seen_addresses:
+                seen_addresses.add(token['address'])
+                known_tokens.append(token)
+
+        # Step 2: one bounded-concurrency batch over all unique addresses
+        known_addresses = [t['address'] for t in known_tokens]
+        results = await self._fetch_dexscreener_batch(candidates + known_addresses)
+        candidate_results = results[:len(candidates)]
+        known_results = results[len(candidates):]
+
+        # Step 3: filter by MCAP range in one vectorized pass
+        fetched = [d for d in candidate_results if d]
+        mcaps = np.fromiter((d.get('market_cap') or 0 for d in fetched), dtype=np.float64, count=len(fetched))
+        in_range = np.flatnonzero((mcaps >= min_mcap) & (mcaps <= max_mcap))[:limit]
+
+        tokens_data = [fetched[i] for i in in_range]
+        for token_data in tokens_data:
+            logger.info(f"   ✅ {token_data['symbol']}: ${token_data['market_cap']:,.0f} MCAP")
+
+        # If we still need more, add known successful tokens
+        if len(tokens_data) < limit and known_tokens:
+            logger.info(f"\n📝 Adding known successful tokens to reach {limit}...")
+
+            for token, token_data in zip(known_tokens, known_results):
+                if len(tokens_data) >= limit:
                     break
 
-                logger.info(f"📊 Strategy {idx}: Fetching from DexScreener...")
-
-                try:
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
-                        if resp.status != 200:
-                            logger.warning(f"   Failed: HTTP {resp.status}")
-                            continue
-
-                        data = await resp.json()
-
-                        # Extract tokens from response
-                        if isinstance(data, list):
-                            tokens = data
-                        else:
-                            tokens = data.get('tokens', [])
-
-                        logger.info(f"   Got {len(tokens)} tokens from API")
-
-                        # Filter for pump.fun graduates in our MCAP range
-                        for token in tokens:
-                            if len(collected_addresses) >= limit:
-                                break
-
-                            # Get token address
-                            token_address = token.get('tokenAddress') or token.get('address')
-                            if not token_address or token_address in collected_addresses:
-                                continue
-
-                            # Skip if already collected (incremental mode)
-                            if token_address in self.existing_tokens:
-                                logger.debug(f"   ⏭️  Skipping existing: {token_address[:8]}...")
-                                continue
-
-                            # Check if it's from pump.fun / Raydium
-                            chain_id = token.get('chainId', '')
-                            if chain_id != 'solana':
-                                continue
-
-                            # Get MCAP from DexScreener full data
-                            token_data = await self.get_dexscreener_data(token_address, session)
-                            if not token_data:
-                                continue
-
-                            mcap = token_data.get('market_cap', 0)
-
-                            # Filter by MCAP range
-                            if min_mcap <= mcap <= max_mcap:
-                                collected_addresses.add(token_address)
-                                tokens_data.append(token_data)
-                                logger.info(f"   ✅ {token_data['symbol']}: ${mcap:,.0f} MCAP")
-
-                        await asyncio.sleep(2)  # Rate limit
-
-                except Exception as e:
-                    logger.error(f"   Error with strategy {idx}: {e}")
-
-            # If we still need more, manually add known successful tokens
-            if len(collected_addresses) < limit:
-                logger.info(f"\n📝 Adding known successful tokens to reach {limit}...")
-                known_tokens = await self.load_known_tokens()
-
-                for token in known_tokens:
-                    if len(collected_addresses) >= limit:
-                        break
-
-                    if token['address'] not in collected_addresses:
-                        token_data = await self.get_dexscreener_data(token['address'], session)
-                        if token_data:
-                            collected_addresses.add(token['address'])
-                            tokens_data.append(token_data)
-                            logger.info(f"   ✅ {token['symbol']}: Known runner")
+                if token_data:
+                    tokens_data.append(token_data)
+                    logger.info(f"   ✅ {token['symbol']}: Known runner")
 
         logger.info(f"\n✅ Collected {len(tokens_data)} tokens for analysis")
         return tokens_data
@@ -225,76 +376,103 @@ class HistoricalDataCollector:
     async def load_known_tokens(self) -> list:
         """Load manually curated known successful tokens"""
         try:
-            with open('data/known_runner_tokens.json', 'r') as f:
-                data = json.load(f)
+            with open('data/known_runner_tokens.json', 'rb') as f:
+                data = orjson.loads(f.read())
                 return data['tokens'][0]['tokens']  # Mega runners
         except:
             return []
 
-    async def get_dexscreener_data(self, token_address: str, session=None) -> dict:
-        """Get comprehensive token data from DexScreener (FREE!)"""
-        try:
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-
-            if session:
-                resp_ctx = session.get(url, timeout=aiohttp.ClientTimeout(total=15))
-            else:
-                resp_ctx = aiohttp.ClientSession().get(url, timeout=aiohttp.ClientTimeout(total=15))
-
-            async with resp_ctx as resp:
-                if resp.status != 200:
-                    return None
-
-                data = await resp.json()
-                pairs = data.get('pairs', [])
-
-                if not pairs:
-                    return None
+    async def _fetch_dexscreener_batch(self, token_addresses: list) -> list:
+        """Fetch DexScreener data for many tokens concurrently (bounded by dex_sem)"""
+        async def fetch(token_address):
+            async with self.dex_sem:
+                return await self.get_dexscreener_data(token_address)
 
-                # Get Raydium pair
-                pair = pairs[0]
-                for p in pairs:
-                    if 'raydium' in p.get('dexId', '').lower():
-                        pair = p
-                        break
+        results = await asyncio.gather(*(fetch(a) for a in token_addresses), return_exceptions=True)
+        return [None if isinstance(r, Exception) else r for r in results]
 
-                # Extract transaction data
-                txns_24h = pair.get('txns', {}).get('h24', {})
-                txns_6h = pair.get('txns', {}).get('h6', {})
-                txns_1h = pair.get('txns', {}).get('h1', {})
+    async def get_dexscreener_data(self, token_address: str, session=None) -> dict:
+        """Get comprehensive token data from DexScreener (FREE!), cached per run"""
+        cached = self._dex_cache.get(token_address)
+        if cached is not None:
+            return cached
 
-                # Calculate buy percentages
-                total_txs_24h = txns_24h.get('buys', 0) + txns_24h.get('sells', 0)
-                total_txs_6h = txns_6h.get('buys', 0) + txns_6h.get('sells', 0)
+        missed_at = self._dex_misses.get(token_address)
+        if missed_at is not None and time.monotonic() - missed_at < DEX_MISS_TTL:
+            return None
 
-                buy_pct_24h = (txns_24h.get('buys', 0) / total_txs_24h * 100) if total_txs_24h > 0 else 0
-                buy_pct_6h = (txns_6h.get('buys', 0) / total_txs_6h * 100) if total_txs_6h > 0 else 0
+        result = await self._fetch_dexscreener_data(token_address, session or self.session)
+        if result:
+            self._dex_cache[token_address] = result
+            self._dex_misses.pop(token_address, None)
+        else:
+            self._dex_misses[token_address] = time.monotonic()
+        return result
 
-                # Classify outcome based on MCAP
-                mcap = float(pair.get('fdv', 0))
-                outcome = self._classify_outcome_by_mcap(mcap)
+    async def _fetch_dexscreener_data(self, token_address: str, session: aiohttp.ClientSession) -> dict:
+        """Fetch and flatten the best DexScreener pair for a token"""
+        try:
+            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
 
-                return {
-                    'token_address': token_address,
-                    'symbol': pair.get('baseToken', {}).get('symbol', 'UNKNOWN'),
-                    'name': pair.get('baseToken', {}).get('name', 'Unknown'),
-                    'price_usd': float(pair.get('priceUsd', 0)),
-                    'market_cap': mcap,
-                    'liquidity': float(pair.get('liquidity', {}).get('usd', 0)),
-                    'volume_24h': float(pair.get('volume', {}).get('h24', 0)),
-                    'volume_6h': float(pair.get('volume', {}).get('h6', 0)),
-                    'buys_24h': txns_24h.get('buys', 0),
-                    'sells_24h': txns_24h.get('sells', 0),
-                    'buys_6h': txns_6h.get('buys', 0),
-                    'sells_6h': txns_6h.get('sells', 0),
-                    'buy_percentage_24h': buy_pct_24h,
-                    'buy_percentage_6h': buy_pct_6h,
-                    'price_change_24h': float(pair.get('priceChange', {}).get('h24', 0)),
-                    'price_change_6h': float(pair.get('priceChange', {}).get('h6', 0)),
-                    'created_at': pair.get('pairCreatedAt', 0),
-                    'outcome': outcome,
-                    'dex_url': pair.get('url', '')
-                }
+            status, body = await self._request_with_retry(session, 'GET', url, timeout=aiohttp.ClientTimeout(total=15))
+            if status != 200:
+                return None
+
+            data = orjson.loads(body)
+
+            pairs = data.get('pairs') or []
+            if not pairs:
+                return None
+
+            # Get Raydium pair
+            pair = next((p for p in pairs if 'raydium' in (p.get('dexId') or '').lower()), pairs[0])
+
+            # Hoist nested sections once instead of re-walking pair for every field
+            txns = pair.get('txns') or {}
+            txns_24h = txns.get('h24') or {}
+            txns_6h = txns.get('h6') or {}
+            base = pair.get('baseToken') or {}
+            liquidity = pair.get('liquidity') or {}
+            volume = pair.get('volume') or {}
+            price_change = pair.get('priceChange') or {}
+
+            buys_24h = txns_24h.get('buys', 0)
+            sells_24h = txns_24h.get('sells', 0)
+            buys_6h = txns_6h.get('buys', 0)
+            sells_6h = txns_6h.get('sells', 0)
+
+            # Calculate buy percentages
+            total_txs_24h = buys_24h + sells_24h
+            total_txs_6h = buys_6h + sells_6h
+
+            buy_pct_24h = (buys_24h / total_txs_24h * 100) if total_txs_24h > 0 else 0
+            buy_pct_6h = (buys_6h / total_txs_6h * 100) if total_txs_6h > 0 else 0
+
+            # Classify outcome based on MCAP
+            mcap = float(pair.get('fdv', 0))
+            outcome = self._classify_outcome_by_mcap(mcap)
+
+            return {
+                'token_address': token_address,
+                'symbol': base.get('symbol', 'UNKNOWN'),
+                'name': base.get('name', 'Unknown'),
+                'price_usd': float(pair.get('priceUsd', 0)),
+                'market_cap': mcap,
+                'liquidity': float(liquidity.get('usd', 0)),
+                'volume_24h': float(volume.get('h24', 0)),
+                'volume_6h': float(volume.get('h6', 0)),
+                'buys_24h': buys_24h,
+                'sells_24h': sells_24h,
+                'buys_6h': buys_6h,
+                'sells_6h': sells_6h,
+                'buy_percentage_24h': buy_pct_24h,
+                'buy_percentage_6h': buy_pct_6h,
+                'price_change_24h': float(price_change.get('h24', 0)),
+                'price_change_6h': float(price_change.get('h6', 0)),
+                'created_at': pair.get('pairCreatedAt', 0),
+                'outcome': outcome,
+                'dex_url': pair.get('url', '')
+            }
 
         except Exception as e:
             logger.debug(f"  DexScreener error for {token_address[:8]}: {e}")
@@ -333,86 +511,105 @@ class HistoricalDataCollector:
             logger.info(f"   🐋 Total whales found: 0 (requires Helius API key)")
             return []
 
+        # Without a price the $50K whale filter can't be applied - skip the RPC calls
+        if token_price <= 0:
+            logger.debug(f"   Skipping whales for {token_symbol}: no price")
+            return []
+
         whale_addresses = []
 
         try:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                # Use Helius RPC to get largest token accounts
-                payload = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "getTokenLargestAccounts",
-                    "params": [token_address]
-                }
-
-                async with session.post(self.helius_rpc_url, json=payload, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-
-                        if 'result' in data and 'value' in data['result']:
-                            accounts = data['result']['value']
-
-                            # Filter for whale-sized positions
-                            for account in accounts[:20]:  # Top 20 holders
-                                address = account.get('address')
-                                amount_raw = account.get('amount', '0')
-                                decimals = account.get('decimals', 6)
-
-                                try:
-                                    # Convert to actual token amount
-                                    balance = float(amount_raw) / (10 ** decimals)
-
-                                    # Calculate USD value if price available
-                                    if token_price > 0:
-                                        usd_value = balance * token_price
-
-                                        # Whale threshold: $50K+
-                                        if usd_value >= 50000:
-                                            # Get the owner address (need to query token account)
-                                            owner = await self._get_token_account_owner(session, address)
-
-                                            if owner and owner not in whale_addresses:
-                                                whale_addresses.append(owner)
-
-                                                # Track this whale
-                                                self.whale_wallets[owner]['tokens_bought'].append({
-                                                    'token_symbol': token_symbol,
-                                                    'token_address': token_address,
-                                                    'usd_value': usd_value,
-                                                    'balance': balance
-                                                })
-                                    else:
-                                        # No price data - consider any top 10 holder a whale
-                                        if len(whale_addresses) < 10:
-                                            owner = await self._get_token_account_owner(session, address)
-                                            if owner and owner not in whale_addresses:
-                                                whale_addresses.append(owner)
-
-                                                self.whale_wallets[owner]['tokens_bought'].append({
-                                                    'token_symbol': token_symbol,
-                                                    'token_address': token_address,
-                                                    'balance': balance
-                                                })
-
-                                except (ValueError, TypeError) as e:
-                                    logger.debug(f"   Error parsing account {address}: {e}")
-                                    continue
-
-                            logger.info(f"   🐋 Total whales found: {len(whale_addresses)}")
-                        else:
-                            logger.debug(f"   No token accounts found for {token_symbol}")
-                            logger.info(f"   🐋 Total whales found: 0")
-                    else:
-                        logger.debug(f"   Helius RPC failed: HTTP {resp.status}")
-                        logger.info(f"   🐋 Total whales found: 0")
+            session = self.session
+
+            # Use Helius RPC to get largest token accounts
+            payload = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getTokenLargestAccounts",
+                "params": [token_address]
+            }
+
+            async with self.rpc_sem:
+                status, body = await self._request_with_retry(
+                    session, 'POST', self.helius_rpc_url, json=payload, timeout=aiohttp.ClientTimeout(total=15)
+                )
+            await self._add_cu(RPC_CU_PER_CALL)
+
+            if status != 200:
+                logger.debug(f"   Helius RPC failed: HTTP {status}")
+                logger.info(f"   🐋 {token_symbol}: 0 whales found")
+                return []
 
-                return whale_addresses
+            data = orjson.loads(body)
+
+            if 'result' not in data or 'value' not in data['result']:
+                logger.debug(f"   No token accounts found for {token_symbol}")
+                logger.info(f"   🐋 {token_symbol}: 0 whales found")
+                return []
+
+            # Filter for whale-sized positions: (token_account, balance, usd_value)
+            candidates = []
+            for account in data['result']['value'][:20]:  # Top 20 holders
+                address = account.get('address')
+                amount_raw = account.get('amount', '0')
+                decimals = account.get('decimals', 6)
+
+                try:
+                    # Convert to actual token amount
+                    balance = float(amount_raw) / (10 ** decimals)
+                except (ValueError, TypeError) as e:
+                    logger.debug(f"   Error parsing account {address}: {e}")
+                    continue
+
+                usd_value = balance * token_price
+
+                # Whale threshold: $50K+
+                if usd_value >= 50000:
+                    candidates.append((address, balance, usd_value))
+
+            # Get the owner addresses (need to query each token account) concurrently
+            owners = await asyncio.gather(*(
+                self._get_token_account_owner(session, address) for address, _, _ in candidates
+            ))
+
+            for (address, balance, usd_value), owner in zip(candidates, owners):
+                if not owner or owner in whale_addresses:
+                    continue
+
+                whale_addresses.append(owner)
+
+                # Track this whale
+                self.whale_wallets[owner].tokens_bought.append({
+                    'token_symbol': token_symbol,
+                    'token_address': token_address,
+                    'usd_value': usd_value,
+                    'balance': balance
+                })
+
+            logger.info(f"   🐋 {token_symbol}: {len(whale_addresses)} whales found")
+            return whale_addresses
 
         except Exception as e:
             logger.debug(f"   Whale extraction error: {e}")
-            logger.info(f"   🐋 Total whales found: 0")
+            logger.info(f"   🐋 {token_symbol}: 0 whales found")
             return []
 
+    async def _extract_and_attach(self, token: dict):
+        """Extract whales for one token and attach them to the token record"""
+        # Extract whales with price for USD value calculation
+        whales = await self.extract_whale_wallets(
+            token['token_address'],
+            token['symbol'],
+            token.get('price_usd', 0)
+        )
+        token['whale_wallets'] = whales
+        token['whale_count'] = len(whales)
+
+        # Update whale win tracking (no awaits below, so concurrent tasks can't interleave)
+        if token['outcome'] in WIN_OUTCOMES:
+            for whale in whales:
+                self.whale_wallets[whale].win_count += 1
+
     async def _get_token_account_owner(self, session: aiohttp.ClientSession, token_account: str) -> str:
         """Get the owner of a token account using Helius RPC"""
         try:
@@ -426,18 +623,23 @@ class HistoricalDataCollector:
                 ]
             }
 
-            async with session.post(self.helius_rpc_url, json=payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
+            async with self.rpc_sem:
+                status, body = await self._request_with_retry(
+                    session, 'POST', self.helius_rpc_url, json=payload, timeout=aiohttp.ClientTimeout(total=10)
+                )
+            await self._add_cu(RPC_CU_PER_CALL)
 
-                    if 'result' in data and data['result'] and 'value' in data['result']:
-                        parsed_data = data['result']['value'].get('data', {})
-                        if isinstance(parsed_data, dict):
-                            parsed = parsed_data.get('parsed', {})
-                            info = parsed.get('info', {})
-                            return info.get('owner', '')
+            if status == 200:
+                data = orjson.loads(body)
 
-                return ''
+                if 'result' in data and data['result'] and 'value' in data['result']:
+                    parsed_data = data['result']['value'].get('data', {})
+                    if isinstance(parsed_data, dict):
+                        parsed = parsed_data.get('parsed', {})
+                        info = parsed.get('info', {})
+                        return info.get('owner', '')
+
+            return ''
         except Exception as e:
             logger.debug(f"   Error getting token account owner: {e}")
             return ''
@@ -461,24 +663,17 @@ class HistoricalDataCollector:
             logger.info("🐋 EXTRACTING WHALE WALLETS (TOP HOLDERS)")
             logger.info("=" * 80)
 
-            for idx, token in enumerate(tokens_data, 1):
-                logger.info(f"\n[{idx}/{len(tokens_data)}] {token['symbol']}...")
+            # Tokens without a price can't pass the $50K filter - don't spend RPC calls on them
+            tokens_to_extract = []
+            for token in tokens_data:
+                if token.get('price_usd', 0) > 0:
+                    tokens_to_extract.append(token)
+                else:
+                    token['whale_wallets'] = []
+                    token['whale_count'] = 0
 
-                # Extract whales with price for USD value calculation
-                whales = await self.extract_whale_wallets(
-                    token['token_address'],
-                    token['symbol'],
-                    token.get('price_usd', 0)
-                )
-                token['whale_wallets'] = whales
-                token['whale_count'] = len(whales)
-
-                # Update whale win tracking
-                if token['outcome'] in ['100x+', '50x', '10x']:
-                    for whale in whales:
-                        self.whale_wallets[whale]['win_count'] += 1
-
-                await asyncio.sleep(1.5)  # Rate limit for Moralis
+            logger.info(f"   Processing {len(tokens_to_extract)} priced tokens (rate limited by rpc_sem)")
+            await asyncio.gather(*(self._extract_and_attach(token) for token in tokens_to_extract))
 
         # Step 3: Analyze whale success rates
         successful_whales = []
@@ -487,18 +682,22 @@ class HistoricalDataCollector:
             logger.info("📊 WHALE ANALYSIS")
             logger.info("=" * 80)
 
-            for wallet, data in self.whale_wallets.items():
-                token_count = len(data['tokens_bought'])
-                if token_count >= 2:  # Whale bought 2+ of our successful tokens
-                    win_rate = (data['win_count'] / token_count) if token_count > 0 else 0
-                    if win_rate >= 0.5:  # 50%+ win rate
-                        successful_whales.append({
-                            'address': wallet,
-                            'tokens_bought_count': token_count,
-                            'wins': data['win_count'],
-                            'win_rate': win_rate,
-                            'tokens': data['tokens_bought']
-                        })
+            # Fold per-wallet stats into parallel arrays and filter in one vectorized pass
+            wallets = list(self.whale_wallets.keys())
+            stats = list(self.whale_wallets.values())
+            wins = np.fromiter((d.win_count for d in stats), dtype=np.int32, count=len(stats))
+            token_counts = np.fromiter((len(d.tokens_bought) for d in stats), dtype=np.int32, count=len(stats))
+            win_rates = wins / np.maximum(token_counts, 1)
+
+            # Whale bought 2+ of our successful tokens with a 50%+ win rate
+            for i in np.flatnonzero((token_counts >= 2) & (win_rates >= 0.5)):
+                successful_whales.append({
+                    'address': wallets[i],
+                    'tokens_bought_count': int(token_counts[i]),
+                    'wins': int(wins[i]),
+                    'win_rate': float(win_rates[i]),
+                    'tokens': stats[i].tokens_bought
+                })
 
             successful_whales.sort(key=lambda x: x['win_rate'], reverse=True)
             logger.info(f"   Found {len(successful_whales)} successful whales (50%+ win rate)")
@@ -514,9 +713,8 @@ class HistoricalDataCollector:
         # Load existing data if available (for incremental updates)
         existing_data = {}
         try:
-            with open('data/historical_training_data.json', 'r') as f:
-                existing_data = json.load(f)
-                logger.info(f"   Found existing data: {existing_data.get('total_tokens', 0)} tokens")
+            existing_data = await asyncio.to_thread(_read_json, 'data/historical_training_data.json')
+            logger.info(f"   Found existing data: {existing_data.get('total_tokens', 0)} tokens")
         except FileNotFoundError:
             logger.info("   Creating new dataset")
 
@@ -533,8 +731,7 @@ class HistoricalDataCollector:
             'tokens': all_tokens
         }
 
-        with open('data/historical_training_data.json', 'w') as f:
-            json.dump(output, f, indent=2)
+        await asyncio.to_thread(_write_json, 'data/historical_training_data.json', output)
         logger.info(f"   ✅ Saved data/historical_training_data.json")
         logger.info(f"   Total: {len(all_tokens)} tokens (+{len(tokens_data)} new)")
 
@@ -546,8 +743,7 @@ class HistoricalDataCollector:
                 'whales': successful_whales
             }
 
-            with open('data/successful_whale_wallets.json', 'w') as f:
-                json.dump(whale_output, f, indent=2)
+            await asyncio.to_thread(_write_json, 'data/successful_whale_wallets.json', whale_output)
             logger.info("   ✅ Saved data/successful_whale_wallets.json")
 
             # Save whales to database for real-time matching
@@ -587,7 +783,7 @@ class HistoricalDataCollector:
             logger.info(f"\n🐋 Identified {len(successful_whales)} successful whales")
             logger.info("   Can use these for whale-copy strategy!")
 
-        logger.info(f"\n💰 Estimated Moralis CU used: {self.total_cu_used}")
+        logger.info(f"\n💰 Estimated CU used: {self.total_cu_used}")
         logger.info(f"   Daily free tier: 40,000 CU")
         logger.info(f"   Usage: {(self.total_cu_used/40000)*100:.1f}%")
 
@@ -595,10 +791,7 @@ class HistoricalDataCollector:
 
     def _get_outcome_distribution(self, tokens_data: list) -> dict:
         """Get distribution of outcomes"""
-        dist = defaultdict(int)
-        for token in tokens_data:
-            dist[token.get('outcome', 'unknown')] += 1
-        return dict(dist)
+        return dict(Counter(token.get('outcome', 'unknown') for token in tokens_data))
 
 
 async def main():
@@ -611,9 +804,30 @@ async def main():
     parser.add_argument('--max-mcap', type=int, default=100000000, help='Maximum MCAP (default: 100M)')
     args = parser.parse_args()
 
+    # Dev profiling: SENTINEL_PROFILE=1 records an async-aware profile (await time
+    # is attributed to the awaiting coroutine) and writes it to prof.html
+    profiler = None
+    if os.getenv('SENTINEL_PROFILE') == '1':
+        try:
+            from pyinstrument import Profiler
+            profiler = Profiler(async_mode='enabled')
+            profiler.start()
+            logger.info("⏱️  Profiling enabled - report will be written to prof.html")
+        except ImportError:
+            logger.warning("⚠️  SENTINEL_PROFILE=1 but pyinstrument not installed (pip install pyinstrument)")
+
     collector = HistoricalDataCollector()
     await collector.initialize()
-    await collector.collect_all(target_count=args.count)
+    try:
+        await collector.collect_all(target_count=args.count)
+    finally:
+        await collector.close()
+
+        if profiler:
+            profiler.stop()
+            with open('prof.html', 'w') as f:
+                f.write(profiler.output_html())
+            logger.info("⏱️  Profile saved to prof.html")
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ Run once: python tools/kill_webhooks.py
 """
 import asyncio
 import aiohttp
+import orjson
 import os
 import sys
 
@@ -24,7 +25,7 @@ async def kill_all_webhooks():
             if resp.status != 200:
                 print(f"ERROR: Failed to list webhooks (HTTP {resp.status})")
                 return
-            webhooks = await resp.json()
+            webhooks = orjson.loads(await resp.read())
 
         print(f"Found {len(webhooks)} webhook(s):")
         for wh in webhooks:
@@ -38,17 +39,22 @@ async def kill_all_webhooks():
             print("No webhooks to delete!")
             return
 
-        # Delete all
-        for wh in webhooks:
-            wh_id = wh.get('webhookID')
-            if not wh_id:
-                continue
+        # Delete all concurrently
+        async def delete_webhook(wh_id):
             del_url = f"https://api.helius.xyz/v0/webhooks/{wh_id}?api-key={api_key}"
             async with session.delete(del_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                if resp.status == 200:
-                    print(f"  DELETED: {wh_id}")
-                else:
-                    print(f"  FAILED to delete {wh_id}: HTTP {resp.status}")
+                return resp.status
+
+        wh_ids = [wh['webhookID'] for wh in webhooks if wh.get('webhookID')]
+        results = await asyncio.gather(*(delete_webhook(wh_id) for wh_id in wh_ids), return_exceptions=True)
+
+        for wh_id, result in zip(wh_ids, results):
+            if isinstance(result, Exception):
+                print(f"  FAILED to delete {wh_id}: {result}")
+            elif result == 200:
+                print(f"  DELETED: {wh_id}")
+            else:
+                print(f"  FAILED to delete {wh_id}: HTTP {result}")
 
         print("\nDone! Webhook spam should stop within seconds.")
 
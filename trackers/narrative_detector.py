@@ -2,10 +2,34 @@
 Narrative Detector - Identify trending narratives and themes
 ENHANCED: Now supports both static narratives and real-time RSS-based detection
 """
-from typing import Dict, List, Set, Optional
-from datetime import datetime, timedelta
+from bisect import bisect_right
+import re
+import sys
+from collections import Counter, OrderedDict, defaultdict, deque
+from typing import DefaultDict, Deque, Dict, List, NamedTuple, Set, Optional, Tuple
+import time
 from loguru import logger
 import config
+from config import WEIGHTS
+
+# Max narrative points per token (100-point conviction budget)
+NARRATIVE_SCORE_CAP = 7
+
+# Narrative mentions older than this are evicted (7 days)
+MENTION_RETENTION_SECONDS = 7 * 86400
+
+# Max (symbol, name, description) entries kept in the keyword match cache
+MATCH_CACHE_SIZE = 8192
+
+# Joins batched texts for a single automaton pass (never part of a keyword)
+KEYWORD_SEPARATOR = '\x1f'
+
+# Optional: Aho-Corasick automaton scans all keywords in a single pass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 # Import realtime detector
 try:
@@ -17,6 +41,13 @@ except ImportError as e:
     logger.warning(f"⚠️  Realtime narrative detector not available: {e}")
 
 
+class NarrativeMatch(NamedTuple):
+    """A static narrative matched by a token (cached, so immutable)"""
+    name: str
+    keywords_matched: Tuple[str, ...]
+    weight: float
+
+
 class NarrativeDetector:
     """
     Detects and scores narrative trends in token names and descriptions
@@ -28,14 +59,98 @@ class NarrativeDetector:
 
     def __init__(self):
         self.narratives = config.HOT_NARRATIVES
-        self.narrative_tracker: Dict[str, List[datetime]] = {}  # narrative -> [timestamps]
+        self.narrative_tracker: DefaultDict[str, Deque[int]] = defaultdict(deque)  # narrative -> unix timestamps (oldest first)
+        # narrative -> {unix hour: mention count}, kept incrementally for trending queries
+        self._hour_buckets: Dict[str, Counter] = defaultdict(Counter)
         self.realtime_detector = None
         self.use_realtime = getattr(config, 'ENABLE_REALTIME_NARRATIVES', False)
+        self._rt_boost_batch = None  # Bound realtime_detector.get_narrative_boost_batch once started
+        self._rt_boost_batch_async = None  # ...and its async (model-pool) variant
+        self._load_weights()
+        self._rebuild_matchers()
+
+    def _load_weights(self):
+        """Cache the narrative scoring weights used on every analysis"""
+        self._w_hot = WEIGHTS['narrative_hot']
+        self._w_multi = WEIGHTS['narrative_multiple']
+        self._w_fresh = WEIGHTS['narrative_fresh']
+
+    def _rebuild_matchers(self):
+        """Rebuild keyword matchers after narratives change"""
+        # (symbol, name, description) -> static matches, LRU order (stale once narratives change)
+        self._match_cache: OrderedDict = OrderedDict()
+        # (name, lowercased keywords, weight) for active narratives, in config order
+        self._active_compiled: List[Tuple[str, Tuple[str, ...], float]] = [
+            (
+                narrative_name,
+                tuple(sys.intern(kw.lower()) for kw in narrative_data.get('keywords', []) if kw),
+                narrative_data.get('weight', 1.0)
+            )
+            for narrative_name, narrative_data in self.narratives.items()
+            if narrative_data.get('active', False)
+        ]
+        # Inverted index: keyword -> owning narratives (keywords shared across narratives stored once)
+        kw_to_narratives = defaultdict(list)
+        for narrative_name, keywords, _ in self._active_compiled:
+            for kw in keywords:
+                kw_to_narratives[kw].append(narrative_name)
+        self._kw_to_narratives: Dict[str, Tuple[str, ...]] = {
+            kw: tuple(narrative_names) for kw, narrative_names in kw_to_narratives.items()
+        }
+
+        self._ac = self._build_automaton()
+        self._kw_re, self._kw_expansions = self._build_regex()
+
+    def _build_automaton(self):
+        """
+        Build an Aho-Corasick automaton over all active narrative keywords
+
+        Each keyword maps to (keyword, owning narratives) so one pass over the text
+        finds every hit. Returns None if pyahocorasick isn't installed or nothing
+        is active (matching then falls back to the compiled keyword regex).
+        """
+        if not AHOCORASICK_AVAILABLE:
+            return None
+
+        owners = self._kw_to_narratives
+        if not owners:
+            return None
+
+        ac = ahocorasick.Automaton()
+        for kw, narrative_names in owners.items():
+            ac.add_word(kw, (kw, narrative_names))
+        ac.make_automaton()
+        return ac
+
+    def _build_regex(self):
+        """
+        Build a single-alternation regex over active keywords (fallback without pyahocorasick)
+
+        The alternation sits in a lookahead so it is tried at every position,
+        longest keyword first. A hit on a long keyword also implies every active
+        keyword it contains ('doge' -> 'dog'), which the expansion map records as
+        keyword -> ((contained keyword, owning narratives), ...). Together these
+        find exactly the keywords a per-keyword substring check would.
+
+        Returns (pattern, expansions), or (None, {}) if nothing is active.
+        """
+        owners = self._kw_to_narratives
+        if not owners:
+            return None, {}
+
+        alternation = '|'.join(re.escape(kw) for kw in sorted(owners, key=len, reverse=True))
+        expansions = {
+            kw: tuple((inner, owners[inner]) for inner in owners if inner in kw)
+            for kw in owners
+        }
+        return re.compile(f"(?=({alternation}))"), expansions
 
     async def start(self):
         """Initialize narrative detector"""
         self.use_static = getattr(config, 'ENABLE_STATIC_NARRATIVES', True)
-        active_count = sum(1 for n in self.narratives.values() if n.get('active', False))
+        self._load_weights()
+        self._rebuild_matchers()
+        active_count = len(self._active_compiled)
 
         logger.info(f"✅ Narrative Detector initialized")
         logger.info(f"   📊 Static narratives: {'ENABLED' if self.use_static else 'DISABLED'} ({active_count} configured)")
@@ -46,6 +161,8 @@ class NarrativeDetector:
             self.realtime_detector = get_narrative_detector(
                 update_interval=getattr(config, 'NARRATIVE_UPDATE_INTERVAL', 900)  # 15 min default
             )
+            self._rt_boost_batch = self.realtime_detector.get_narrative_boost_batch
+            self._rt_boost_batch_async = self.realtime_detector.get_narrative_boost_batch_async
             # Start background loop
             import asyncio
             asyncio.create_task(self.realtime_detector.narrative_loop())
@@ -71,73 +188,209 @@ class NarrativeDetector:
 
         Uses real-time RSS detection if enabled, otherwise static narratives
         """
-        # Try realtime detection first (if enabled and available)
-        realtime_score = 0
-        realtime_reason = ""
+        return self.analyze_tokens([(symbol, name, description)])[0]
+
+    async def analyze_token_async(self, symbol: str, name: str = '', description: str = '') -> Dict:
+        """analyze_token for callers on the event loop (realtime embedding runs on the model pool)"""
+        return (await self.analyze_tokens_async([(symbol, name, description)]))[0]
+
+    def analyze_tokens(self, items: List[Tuple[str, str, str]]) -> List[Dict]:
+        """
+        Analyze a batch of (symbol, name, description) tuples
+
+        Static keyword matching for the whole batch runs in one automaton pass, so
+        per-call overhead is paid once instead of per token. Results are in input
+        order, same shape as analyze_token.
+
+        Realtime boosts are embedded inline, outside the realtime detector's model
+        semaphore - use analyze_tokens_async from the event loop.
+        """
+        # Realtime boosts for the whole batch in one embed + matmul
+        rt_boosts = None
+        if self._rt_boost_batch is not None:
+            rt_boosts = self._rt_boost_batch([(name, symbol, description) for symbol, name, description in items])
+
+        return self._score_tokens(items, rt_boosts)
 
-        if self.use_realtime and self.realtime_detector:
-            realtime_score, realtime_reason = self.realtime_detector.get_narrative_boost(
-                name, symbol, description
+    async def analyze_tokens_async(self, items: List[Tuple[str, str, str]]) -> List[Dict]:
+        """
+        Async analyze_tokens: realtime token embeddings never block the event loop
+        on torch, and never wait long behind a BERTopic update (see
+        RealtimeNarrativeDetector.get_narrative_boost_batch_async)
+        """
+        rt_boosts = None
+        if self._rt_boost_batch_async is not None:
+            rt_boosts = await self._rt_boost_batch_async(
+                [(name, symbol, description) for symbol, name, description in items]
             )
 
-        # Static narrative analysis (if enabled)
-        combined_text = f"{symbol} {name} {description}".lower()
-        matched_narratives = []
-        static_score = 0
+        return self._score_tokens(items, rt_boosts)
 
+    def _score_tokens(self, items: List[Tuple[str, str, str]], rt_boosts: Optional[List[Tuple[int, str]]]) -> List[Dict]:
+        """Static matching, mention tracking and final scores for a batch, given its realtime boosts"""
         use_static = getattr(self, 'use_static', True)  # Default True for backwards compat
+
+        # Static narrative analysis (if enabled) - cached matches, misses scanned together
+        static_matches = [()] * len(items)
         if use_static:
-            # Check static narratives
-            for narrative_name, narrative_data in self.narratives.items():
-                if not narrative_data.get('active', False):
-                    continue
+            cache = self._match_cache
+            misses = []
+            for idx, item in enumerate(items):
+                cached = cache.get(item)
+                if cached is None:
+                    misses.append(idx)
+                else:
+                    cache.move_to_end(item)
+                    static_matches[idx] = cached
+
+            texts = [self._combined_text(*items[i]) for i in misses]
+            for idx, matches in zip(misses, self._match_texts(texts)):
+                static_matches[idx] = cache[items[idx]] = matches
+                if len(cache) > MATCH_CACHE_SIZE:
+                    cache.popitem(last=False)
 
-                keywords = narrative_data.get('keywords', [])
-                weight = narrative_data.get('weight', 1.0)
+        # One timestamp for every mention recorded by this call
+        now = int(time.time())
+        now_hour = now // 3600
+        cutoff = now - MENTION_RETENTION_SECONDS
 
-                # Check for keyword matches
-                matches = [kw for kw in keywords if kw in combined_text]
+        w_hot, w_multi, w_fresh = self._w_hot, self._w_multi, self._w_fresh
 
-                if matches:
-                    matched_narratives.append({
-                        'name': narrative_name,
-                        'keywords_matched': matches,
-                        'weight': weight
-                    })
+        results = []
+        for idx, narrative_matches in enumerate(static_matches):
+            # Try realtime detection first (if enabled and available)
+            realtime_score = 0
+            realtime_reason = ""
 
-                    # Track this narrative mention
-                    if narrative_name not in self.narrative_tracker:
-                        self.narrative_tracker[narrative_name] = []
-                    self.narrative_tracker[narrative_name].append(datetime.utcnow())
+            if rt_boosts is not None:
+                realtime_score, realtime_reason = rt_boosts[idx]
+
+            matched_narratives = []
+            static_score = 0
+            best_name, best_weight = None, float('-inf')
+
+            for match in narrative_matches:
+                # Highest-weight match (first one wins ties)
+                if match.weight > best_weight:
+                    best_name, best_weight = match.name, match.weight
+
+                # Dicts only at the result boundary (Telegram/scoring consumers use .get)
+                matched_narratives.append(match._asdict())
+
+                # Track this narrative mention, evicting expired ones as we go (amortized O(1))
+                mentions = self.narrative_tracker[match.name]
+                mentions.append(now)
+                while mentions[0] <= cutoff:
+                    mentions.popleft()
+                self._hour_buckets[match.name][now_hour] += 1
 
             # Calculate static score
             if matched_narratives:
-                best_narrative = max(matched_narratives, key=lambda x: x['weight'])
+                static_score += w_hot
 
-                from config import WEIGHTS
+                if len(matched_narratives) > 1:
+                    static_score += w_multi
 
-                static_score += WEIGHTS['narrative_hot']
+                # Freshness can't raise a score that's already at the cap
+                if static_score < NARRATIVE_SCORE_CAP and self._is_narrative_fresh(best_name, now):
+                    static_score += w_fresh
 
-                if len(matched_narratives) > 1:
-                    static_score += WEIGHTS['narrative_multiple']
-
-                if self._is_narrative_fresh(best_narrative['name']):
-                    static_score += WEIGHTS['narrative_fresh']
-
-        # Use max of realtime or static (realtime usually wins)
-        final_score = max(realtime_score, static_score)
-
-        return {
-            'has_narrative': final_score > 0,
-            'narratives': matched_narratives,
-            'primary_narrative': matched_narratives[0]['name'] if matched_narratives else None,
-            'score': min(final_score, 7),  # Cap at 7 points (100-point budget)
-            'realtime_score': realtime_score,
-            'static_score': static_score,
-            'realtime_reason': realtime_reason if realtime_score > 0 else None
-        }
+            # Use max of realtime or static (realtime usually wins)
+            final_score = max(realtime_score, static_score)
+
+            results.append({
+                'has_narrative': final_score > 0,
+                'narratives': matched_narratives,
+                'primary_narrative': matched_narratives[0]['name'] if matched_narratives else None,
+                'score': min(final_score, NARRATIVE_SCORE_CAP),
+                'realtime_score': realtime_score,
+                'static_score': static_score,
+                'realtime_reason': realtime_reason if realtime_score > 0 else None
+            })
+
+        return results
+
+    @staticmethod
+    def _combined_text(symbol: str, name: str, description: str) -> str:
+        """
+        Lowercased text to match keywords against
+
+        Skips empty fields and a name that just repeats the symbol (common), and
+        only lowercases when the text isn't already lowercase.
+        """
+        parts = [symbol] if symbol else []
+        if name and name != symbol:
+            parts.append(name)
+        if description:
+            parts.append(description)
+
+        combined_text = ' '.join(parts)
+        if not combined_text.islower():
+            combined_text = combined_text.lower()
+        return combined_text
+
+    def _match_texts(self, texts: List[str]) -> List[Tuple[NarrativeMatch, ...]]:
+        """
+        Match lowercased token texts against the active static narratives
+
+        Pure (no tracking or scoring), so results are safe to cache. Returns, per
+        text, a tuple of NarrativeMatch records in config order.
+        """
+        results = []
+        for hits in self._find_hits(texts):
+            if not hits:  # Most tokens match nothing
+                results.append(())
+                continue
+
+            narrative_matches = []
+
+            # Check static narratives (keeps config keyword order)
+            for narrative_name, keywords, weight in self._active_compiled:
+                found = hits.get(narrative_name)
+                if found:
+                    narrative_matches.append(
+                        NarrativeMatch(narrative_name, tuple(kw for kw in keywords if kw in found), weight)
+                    )
+
+            results.append(tuple(narrative_matches))
+
+        return results
+
+    def _find_hits(self, texts: List[str]) -> List[Dict[str, Set[str]]]:
+        """
+        Per text, a dict of narrative -> set of keywords found
+
+        All texts are joined with a separator no keyword contains and scanned in a
+        single C-level pass (Aho-Corasick automaton, else the compiled keyword
+        regex); hits are mapped back to rows by offset.
+        """
+        hits = [defaultdict(set) for _ in texts]
+        if self._ac is None and self._kw_re is None:
+            return hits
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        joined = KEYWORD_SEPARATOR.join(texts)
+
+        if self._ac is not None:
+            for end_idx, (kw, narrative_names) in self._ac.iter(joined):
+                row = hits[bisect_right(starts, end_idx) - 1]
+                for narrative_name in narrative_names:
+                    row[narrative_name].add(kw)
+        else:
+            expansions = self._kw_expansions
+            for match in self._kw_re.finditer(joined):
+                row = hits[bisect_right(starts, match.start()) - 1]
+                for kw, narrative_names in expansions[match.group(1)]:
+                    for narrative_name in narrative_names:
+                        row[narrative_name].add(kw)
+
+        return hits
     
-    def _is_narrative_fresh(self, narrative_name: str) -> bool:
+    def _is_narrative_fresh(self, narrative_name: str, now: Optional[float] = None) -> bool:
         """Check if a narrative is less than 48 hours old"""
         if narrative_name not in self.narrative_tracker:
             return True
@@ -146,25 +399,23 @@ class NarrativeDetector:
         if not mentions:
             return True
         
-        # Check oldest mention
-        oldest_mention = min(mentions)
-        age_hours = (datetime.utcnow() - oldest_mention).total_seconds() / 3600
-        
-        return age_hours < 48
+        # Mentions are appended in time order, so the oldest is first
+        return (now or time.time()) - mentions[0] < 48 * 3600
     
     def get_trending_narratives(self, hours: int = 24) -> List[Dict]:
-        """Get narratives with most activity in recent hours"""
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        """Get narratives with most activity in recent hours (hour granularity)"""
+        # Sum the last `hours` hourly buckets, current hour included
+        first_hour = int(time.time()) // 3600 - hours + 1
         
         trending = []
         
-        for narrative_name, mentions in self.narrative_tracker.items():
-            recent_mentions = [m for m in mentions if m > cutoff]
+        for narrative_name, buckets in self._hour_buckets.items():
+            recent_count = sum(count for hour, count in buckets.items() if hour >= first_hour)
             
-            if recent_mentions:
+            if recent_count:
                 trending.append({
                     'name': narrative_name,
-                    'mentions': len(recent_mentions),
+                    'mentions': recent_count,
                     'weight': self.narratives[narrative_name].get('weight', 1.0)
                 })
         
@@ -174,17 +425,29 @@ class NarrativeDetector:
         return trending
     
     def cleanup_old_data(self):
-        """Remove narrative mentions older than 7 days"""
-        cutoff = datetime.utcnow() - timedelta(days=7)
+        """
+        Remove narrative mentions older than 7 days
+
+        Active narratives are already trimmed on every append; this catches
+        narratives that stopped getting mentions and drops empty entries.
+        """
+        cutoff = time.time() - MENTION_RETENTION_SECONDS
         
-        for narrative_name in list(self.narrative_tracker.keys()):
-            self.narrative_tracker[narrative_name] = [
-                m for m in self.narrative_tracker[narrative_name]
-                if m > cutoff
-            ]
+        for narrative_name, mentions in list(self.narrative_tracker.items()):
+            while mentions and mentions[0] <= cutoff:
+                mentions.popleft()
             
-            if not self.narrative_tracker[narrative_name]:
+            if not mentions:
                 del self.narrative_tracker[narrative_name]
+
+        cutoff_hour = int(cutoff) // 3600
+        for narrative_name in list(self._hour_buckets.keys()):
+            buckets = self._hour_buckets[narrative_name]
+            for hour in [h for h in buckets if h < cutoff_hour]:
+                del buckets[hour]
+
+            if not buckets:
+                del self._hour_buckets[narrative_name]
     
     def update_narrative(self, narrative_name: str, active: bool = None, weight: float = None):
         """Dynamically update a narrative's status or weight"""
@@ -196,6 +459,8 @@ class NarrativeDetector:
             if weight is not None:
                 self.narratives[narrative_name]['weight'] = weight
                 logger.info(f"📝 Narrative '{narrative_name}' weight set to {weight}")
+
+            self._rebuild_matchers()
     
     def add_narrative(self, name: str, keywords: List[str], weight: float = 1.0):
         """Add a new narrative to track"""
@@ -204,4 +469,5 @@ class NarrativeDetector:
             'weight': weight,
             'active': True
         }
+        self._rebuild_matchers()
         logger.info(f"➕ Added new narrative: {name} (weight: {weight})")
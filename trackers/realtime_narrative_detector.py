@@ -14,21 +14,115 @@ Based on Grok recommendations for better early detection.
 import asyncio
 import concurrent.futures
 import functools
+import html
+import math
+import os
+import re
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from loguru import logger
 
+import aiohttp
 import feedparser
+
+# Thread budget for model inference: half the cores, so a scan and a BERTopic update can't
+# oversubscribe the CPU. OMP/MKL read these at import, so set them before torch is loaded
+# (setdefault: explicit deploy settings win)
+TORCH_THREADS = max(1, (os.cpu_count() or 2) // 2)
+os.environ.setdefault("OMP_NUM_THREADS", str(TORCH_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(TORCH_THREADS))
+
 from bertopic import BERTopic
+from bertopic.vectorizers import OnlineCountVectorizer
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import IncrementalPCA
 from sentence_transformers import SentenceTransformer
 import numpy as np
-
-# Dedicated thread pool for RSS fetches (prevents blocking the event loop)
-_rss_executor = concurrent.futures.ThreadPoolExecutor(max_workers=6, thread_name_prefix="rss")
+import torch
+
+# Optional: int8-quantized ONNX MiniLM (2-4x faster CPU encode than FP32 PyTorch)
+try:
+    import onnxruntime
+    from bertopic.backend import BaseEmbedder
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    BaseEmbedder = object
+    ONNX_AVAILABLE = False
+
+# Optional: streaming C XML parser for feeds (feedparser is pure Python; kept as fallback)
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Optional: static (model2vec) embeddings for per-token narrative scoring - no transformer
+# forward per token; MiniLM stays for BERTopic fitting
+try:
+    from model2vec import StaticModel
+    MODEL2VEC_AVAILABLE = True
+except ImportError:
+    MODEL2VEC_AVAILABLE = False
 
 # User-Agent to avoid RSS feeds blocking us as a bot
 _RSS_USER_AGENT = "Mozilla/5.0 (compatible; SentinelBot/2.0; +https://github.com)"
 
+# Per-feed fetch timeout (seconds)
+RSS_FEED_TIMEOUT = 15
+
+# RSS <item> openings and each item's <link> text, for the no-new-articles prefilter
+_ITEM_RE = re.compile(rb"<item[\s>]")
+_ITEM_LINK_RE = re.compile(rb"<item[\s>].*?<link>\s*([^<\s]+)\s*</link>", re.DOTALL)
+
+# Only articles from the last 24h are used; seen-URLs are kept 2x that so nothing re-enters
+ARTICLE_MAX_AGE = timedelta(hours=24)
+ARTICLE_CACHE_RETENTION = 2 * ARTICLE_MAX_AGE
+ARTICLE_CACHE_MAX = 50_000  # Hard cap on remembered article URLs (oldest evicted first)
+
+# SentenceTransformer encode settings (titles/summaries and token names are short)
+ENCODE_BATCH_SIZE = 1024
+EMBEDDER_MAX_SEQ_LENGTH = 128
+
+# Static embedding model used for topic/token similarity when model2vec is installed
+FAST_EMBEDDER_MODEL = "minishlab/potion-base-8M"
+
+# Quantized ONNX export of MiniLM (built once on first start, reused after)
+ONNX_SOURCE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+ONNX_MODEL_DIR = os.getenv(
+    'NARRATIVE_ONNX_DIR',
+    os.path.join(os.path.expanduser("~"), ".cache", "sentinel", "minilm-l6-int8")
+)
+ONNX_MODEL_FILE = "model_quantized.onnx"
+
+# Online BERTopic: incremental reduction + clustering, so each cycle only learns the new articles
+BERTOPIC_N_CLUSTERS = 15
+BERTOPIC_N_COMPONENTS = 5
+BERTOPIC_MIN_BATCH = BERTOPIC_N_CLUSTERS  # MiniBatchKMeans needs >= n_clusters docs on its first batch
+BERTOPIC_WORD_DECAY = 0.01  # Fade word counts from old batches so new narratives can surface
+
+# Narrative boost ladder: similarity strictly above THRESHOLDS[i-1] earns TIERS[i]
+NARRATIVE_SIM_THRESHOLDS = (0.3, 0.4, 0.5, 0.7)
+NARRATIVE_SIM_TIERS = (
+    (0, None),                                  # No match
+    (10, "Partial match to '{name}'"),          # Weak match
+    (15, "Weak match to '{name}' narrative"),   # Medium match
+    (20, "Matches '{name}' narrative"),         # Strong match
+    (25, "Strong match to '{name}' narrative"), # Very strong match
+)
+
+# Token texts whose embeddings are kept (names/symbols repeat a lot across scans)
+TOKEN_EMB_CACHE_SIZE = 8192
+
+# Max seconds live scoring waits for the MiniLM fallback behind BERTopic work before giving up
+SCORING_ENCODE_TIMEOUT = 2.0
+
 
 # RSS sources (crypto/Solana-focused, high-signal)
 # Expanded from 7 to 17 sources for better coverage
@@ -65,6 +159,196 @@ RSS_SOURCES = [
     "https://decrypt.co/feed/nft",  # Decrypt NFT section
 ]
 
+class FeedEntry(NamedTuple):
+    """One RSS/Atom item, parser-independent"""
+    link: Optional[str]
+    title: str
+    summary: str
+    published: Optional[Tuple[int, ...]]  # UTC (Y, M, D, h, m, s), None if missing/unparseable
+
+
+def _parse_entry_date(text: Optional[str]) -> Optional[Tuple[int, ...]]:
+    """RFC 822 (RSS pubDate) or ISO 8601 (Atom) date -> UTC 6-tuple"""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        dt = parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return tuple(dt.utctimetuple()[:6])  # Naive dates are taken as UTC
+
+
+def _parse_feed_lxml(body: bytes) -> List[FeedEntry]:
+    """Stream <item>/<entry> elements with lxml, freeing each one after reading it"""
+    entries = []
+    for _, elem in etree.iterparse(
+        BytesIO(body), events=('end',), tag=('{*}item', '{*}entry'),
+        recover=True, resolve_entities=False
+    ):
+        # RSS <link>text</link>, or Atom <link rel="alternate" href="..."/>
+        link = None
+        for link_el in elem.iterfind('{*}link'):
+            href = link_el.get('href')
+            if href is None:
+                link = (link_el.text or '').strip() or None
+            elif link_el.get('rel', 'alternate') == 'alternate':
+                link = href.strip() or None
+            if link:
+                break
+        if not link:
+            link = (elem.findtext('{*}guid') or elem.findtext('{*}id') or '').strip() or None
+
+        summary = elem.findtext('{*}summary') or elem.findtext('{*}description') or ''
+        if not summary:
+            summary = elem.findtext('{*}encoded') or elem.findtext('{*}content') or ''
+
+        entries.append(FeedEntry(
+            link=link,
+            title=elem.findtext('{*}title') or '',
+            summary=summary,
+            published=_parse_entry_date(
+                elem.findtext('{*}pubDate') or elem.findtext('{*}published')
+                or elem.findtext('{*}updated') or elem.findtext('{*}date')
+            )
+        ))
+
+        # Free the element and the already-processed siblings before it
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    return entries
+
+
+def _parse_feed_feedparser(body: bytes, url: str) -> List[FeedEntry]:
+    """feedparser fallback (lxml missing, or the document wasn't parseable XML)"""
+    feed = feedparser.parse(body)
+    if feed.bozo and not feed.entries:
+        logger.debug(f"   ⚠️  RSS malformed/empty: {url} — {getattr(feed.bozo_exception, 'getMessage', lambda: str(feed.bozo_exception))()}")
+        return []
+
+    entries = []
+    for entry in feed.entries:
+        summary = entry.get("summary", "")
+        if not summary:
+            content_list = entry.get("content", [])
+            if content_list:
+                summary = content_list[0].get("value", "")
+
+        pub_date = entry.get("published_parsed") or entry.get("updated_parsed")
+        try:
+            published = tuple(pub_date[:6]) if pub_date else None
+        except TypeError:
+            published = None  # Bad date format, include article anyway
+
+        entries.append(FeedEntry(
+            link=entry.get('link') or entry.get('id'),
+            title=entry.get("title", ""),
+            summary=summary,
+            published=published
+        ))
+    return entries
+
+
+def _parse_feed_bytes(body: bytes, url: str) -> List[FeedEntry]:
+    """Parse a downloaded feed into FeedEntry items (runs in the RSS thread pool)"""
+    if LXML_AVAILABLE:
+        try:
+            entries = _parse_feed_lxml(body)
+            if entries:
+                return entries
+        except Exception as e:
+            logger.debug(f"   lxml could not parse {url} ({e}), trying feedparser")
+    return _parse_feed_feedparser(body, url)
+
+
+def _topic_wordset(words: List[str]) -> frozenset:
+    """Lower-cased whitespace tokens of a topic's words (n-grams split), for momentum overlap"""
+    return frozenset(' '.join(words).lower().split())
+
+
+# Dedicated thread pool for feed parsing (keeps it off the event loop)
+# Downloads go through aiohttp; one worker per feed so no parse waits for a free thread
+_rss_executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(RSS_SOURCES), thread_name_prefix="rss")
+
+# Model work (embedder / BERTopic) gets its own pool so it never competes with RSS parsing or
+# other libraries for the default executor's few threads on small Railway instances
+MODEL_CONCURRENCY = 4 if torch.cuda.is_available() else 1
+_model_executor = concurrent.futures.ThreadPoolExecutor(max_workers=MODEL_CONCURRENCY, thread_name_prefix="bertopic")
+
+
+class OnnxMiniLMEmbedder(BaseEmbedder):
+    """
+    all-MiniLM-L6-v2 on ONNX Runtime with dynamic int8 quantization
+
+    Drop-in for the SentenceTransformer calls this module makes: encode() returns
+    mean-pooled, L2-normalized float32 vectors. Subclasses BERTopic's BaseEmbedder
+    so it can also be passed as BERTopic's embedding_model.
+    """
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR):
+        super().__init__()
+        if not os.path.exists(os.path.join(model_dir, ONNX_MODEL_FILE)):
+            self._export_quantized(model_dir)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = TORCH_THREADS  # Same thread budget as the torch path
+        session_options.inter_op_num_threads = 1
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir, file_name=ONNX_MODEL_FILE, session_options=session_options
+        )
+        self.max_seq_length = EMBEDDER_MAX_SEQ_LENGTH
+
+    @staticmethod
+    def _export_quantized(model_dir: str):
+        """One-time ONNX export + dynamic int8 quantization (VNNI kernels on AVX512 hosts)"""
+        logger.info(f"🔄 Exporting int8 ONNX MiniLM to {model_dir} (one-time)...")
+        model = ORTModelForFeatureExtraction.from_pretrained(ONNX_SOURCE_MODEL, export=True)
+        quantizer = ORTQuantizer.from_pretrained(model)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=model_dir, quantization_config=qconfig)
+        AutoTokenizer.from_pretrained(ONNX_SOURCE_MODEL).save_pretrained(model_dir)
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = ENCODE_BATCH_SIZE,
+        normalize_embeddings: bool = True,
+        convert_to_numpy: bool = True,
+        show_progress_bar: bool = False
+    ) -> np.ndarray:
+        """Embed texts as an (n, 384) float32 array (unit vectors if normalize_embeddings)"""
+        if isinstance(texts, str):
+            texts = [texts]
+
+        chunks = []
+        for i in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[i:i + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+
+            # Mean-pool over real tokens (same pooling as the sentence-transformers model)
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            chunks.append(pooled.astype(np.float32))
+
+        embeddings = np.vstack(chunks) if chunks else np.zeros((0, 384), dtype=np.float32)
+        if normalize_embeddings:
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+        return embeddings
+
+    def embed(self, documents: List[str], verbose: bool = False) -> np.ndarray:
+        """BERTopic BaseEmbedder hook"""
+        return self.encode(documents)
+
 
 class RealtimeNarrativeDetector:
     """
@@ -82,10 +366,24 @@ class RealtimeNarrativeDetector:
             update_interval_seconds: How often to update narratives (default: 900 = 15min)
         """
         self.update_interval = update_interval_seconds
-        self.article_cache = {}  # URL → timestamp to avoid duplicates
+        # hash(URL) → first-seen timestamp to avoid duplicates; oldest first, pruned after 48h or past ARTICLE_CACHE_MAX
+        self.article_cache: "OrderedDict[int, datetime]" = OrderedDict()
+        # hash(URL) of undated (or future-dated) articles: the date filter can't reject them on a
+        # later sighting, so they're never age-pruned - only the oldest go past ARTICLE_CACHE_MAX
+        self._undated_cache: "OrderedDict[int, None]" = OrderedDict()
         self.current_topics = None  # Latest BERTopic results
-        self.topic_model = None  # BERTopic instance (load once)
+        self._token_emb_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()  # token_text → unit embedding, LRU order
+        # Serializes model work (encode / BERTopic) in the executor so PyTorch thread pools don't multiply
+        self._embed_sem = asyncio.Semaphore(MODEL_CONCURRENCY)
+        self._topic_matrix: Optional[np.ndarray] = None  # (n_topics, dim) L2-normalized topic-word embeddings, row i = current_topics['topics'][i]
+        self.topic_model = None  # BERTopic instance (load once, partial_fit every cycle)
+        self._pending_articles: List[str] = []  # New articles held back until a batch is big enough
+        self._pending_embeddings: Optional[np.ndarray] = None  # Embeddings of a prefix of them, so each is encoded once
+        self._models_ready = False
         self.embedder = None  # SentenceTransformer model
+        self.embedder_fast = None  # model2vec StaticModel for topic/token scoring (if installed)
+        self._session: Optional[aiohttp.ClientSession] = None  # RSS HTTP session (created lazily)
+        self._feed_meta: Dict[str, Tuple[Optional[str], Optional[str]]] = {}  # URL → (ETag, Last-Modified) for conditional GETs
         self.last_update = None
         self.is_running = False
         self.narrative_history = []  # Track narrative evolution over time
@@ -93,22 +391,61 @@ class RealtimeNarrativeDetector:
 
         logger.info(f"📰 RealtimeNarrativeDetector initialized (update every {update_interval_seconds}s)")
 
-    def initialize_models(self):
+    async def initialize_models_async(self):
+        """
+        Load the models in the executor on first call (no-op afterwards)
+
+        Loading MiniLM takes seconds of blocking torch work, so it never runs on
+        the event loop.
+        """
+        if self._models_ready:
+            return
+        await asyncio.wait_for(
+            self._run_model(self._init_models_sync),
+            timeout=120  # 2 min timeout for model download
+        )
+        self._models_ready = True
+
+    def _init_models_sync(self):
         """
         Initialize BERTopic and embedding models (load once)
         Lazy loading to avoid startup delays
         """
+        torch.set_num_threads(TORCH_THREADS)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # Only settable before torch's first inter-op parallel work
+
+        if self.embedder is None and ONNX_AVAILABLE:
+            try:
+                logger.info("🔄 Loading int8 ONNX MiniLM (all-MiniLM-L6-v2)...")
+                self.embedder = OnnxMiniLMEmbedder()
+                logger.info("✅ Embedder loaded (ONNX int8)")
+            except Exception as e:
+                logger.warning(f"⚠️ ONNX embedder unavailable ({e}), falling back to PyTorch")
+
         if self.embedder is None:
             logger.info("🔄 Loading SentenceTransformer (all-MiniLM-L6-v2)...")
             self.embedder = SentenceTransformer("all-MiniLM-L6-v2")
+            self.embedder.max_seq_length = EMBEDDER_MAX_SEQ_LENGTH  # Default 256; inputs are short
             logger.info("✅ Embedder loaded")
 
+        if self.embedder_fast is None and MODEL2VEC_AVAILABLE:
+            try:
+                logger.info(f"🔄 Loading static embedder ({FAST_EMBEDDER_MODEL})...")
+                self.embedder_fast = StaticModel.from_pretrained(FAST_EMBEDDER_MODEL)
+                logger.info("✅ Static embedder loaded (narrative scoring)")
+            except Exception as e:
+                logger.warning(f"⚠️ Static embedder unavailable ({e}), scoring with MiniLM")
+
         if self.topic_model is None:
             logger.info("🔄 Initializing BERTopic model...")
             self.topic_model = BERTopic(
                 embedding_model=self.embedder,
-                min_topic_size=2,  # Minimum for small article sets
-                nr_topics="auto",  # Auto-reduce similar topics
+                umap_model=IncrementalPCA(n_components=BERTOPIC_N_COMPONENTS),
+                hdbscan_model=MiniBatchKMeans(n_clusters=BERTOPIC_N_CLUSTERS, random_state=42),
+                vectorizer_model=OnlineCountVectorizer(stop_words="english", decay=BERTOPIC_WORD_DECAY),
                 verbose=False  # Reduce log spam
             )
             logger.info("✅ BERTopic model initialized")
@@ -120,85 +457,179 @@ class RealtimeNarrativeDetector:
         Returns:
             List of article texts (title + summary)
         """
-        cutoff = datetime.utcnow() - timedelta(hours=24)  # Only last 24h for relevance
-
-        async def _fetch_single_feed(url: str) -> List[str]:
-            """Fetch a single RSS feed with timeout and User-Agent"""
-            articles = []
-            try:
-                loop = asyncio.get_event_loop()
-                parse_fn = functools.partial(feedparser.parse, url, agent=_RSS_USER_AGENT)
-                feed = await asyncio.wait_for(
-                    loop.run_in_executor(_rss_executor, parse_fn),
-                    timeout=15  # 15 second timeout per feed
-                )
-
-                if feed.bozo and not feed.entries:
-                    logger.debug(f"   ⚠️  RSS malformed/empty: {url} — {getattr(feed.bozo_exception, 'getMessage', lambda: str(feed.bozo_exception))()}")
-                    return articles
-
-                for entry in feed.entries:
-                    # Check for duplicate first (more efficient than parsing dates)
-                    entry_link = getattr(entry, 'link', None) or getattr(entry, 'id', None)
-                    if not entry_link:
-                        continue
-                    if entry_link in self.article_cache:
-                        continue
-
-                    # Date filter (lenient: accept articles without dates)
-                    pub_date = entry.get("published_parsed") or entry.get("updated_parsed")
-                    if pub_date:
-                        try:
-                            pub_dt = datetime(*pub_date[:6])
-                            if pub_dt <= cutoff:
-                                continue
-                        except (TypeError, ValueError):
-                            pass  # Bad date format, include article anyway
-
-                    title = entry.get("title", "")
-                    summary = entry.get("summary", "")
-
-                    if not summary:
-                        content_list = entry.get("content", [])
-                        if content_list:
-                            summary = content_list[0].get("value", "")
-
-                    text = f"{title} {summary}".strip()
-                    if len(text) < 20:
-                        continue
-
-                    articles.append(text)
-                    self.article_cache[entry_link] = datetime.utcnow()
-
-                if articles:
-                    logger.info(f"   ✅ {len(articles)} articles from {url.split('/')[2]}")
-
-            except asyncio.TimeoutError:
-                logger.warning(f"   ⏰ RSS timeout (15s): {url}")
-            except Exception as e:
-                logger.warning(f"   ⚠️  RSS failed: {url} — {e}")
-            return articles
+        now = datetime.utcnow()
+        cutoff = now - ARTICLE_MAX_AGE  # Only last 24h for relevance
+
+        # Forget dated URLs first seen 48h+ ago - they're past the cutoff, so dedup no longer needs them
+        prune_cutoff = now - ARTICLE_CACHE_RETENTION
+        cache = self.article_cache
+        while cache and next(iter(cache.values())) <= prune_cutoff:
+            cache.popitem(last=False)
+
+        session = self._get_session()
+        loop = asyncio.get_running_loop()
+
+        async def _fetch_single_feed(url: str):
+            """
+            Download a single RSS feed (async), then parse the bytes into FeedEntry
+            items in the thread pool
+
+            Sends the feed's last ETag/Last-Modified; returns None on 304 Not Modified
+            or when every item link is already in article_cache.
+            """
+            headers = {}
+            etag, modified = self._feed_meta.get(url, (None, None))
+            if etag:
+                headers['If-None-Match'] = etag
+            if modified:
+                headers['If-Modified-Since'] = modified
+
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    return None
+                response.raise_for_status()
+                body = await response.read()
+                validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            if self._all_items_seen(body):
+                self._feed_meta[url] = validators
+                return None
+            entries = await loop.run_in_executor(_rss_executor, _parse_feed_bytes, body, url)
+            # Only remember validators once the body parsed - a 304 must never hide unread items
+            self._feed_meta[url] = validators
+            return entries
 
-        # Fetch all feeds concurrently (max 15s per feed, ~15s total instead of 17×15s)
+        # Phase 1: fetch all feeds concurrently (~15s worst case instead of 17×15s)
         logger.info(f"   📡 Fetching {len(RSS_SOURCES)} RSS feeds concurrently...")
-        results = await asyncio.gather(
+        feeds = await asyncio.gather(
             *[_fetch_single_feed(url) for url in RSS_SOURCES],
             return_exceptions=True
         )
 
+        # Phase 2: filter entries synchronously (no awaits needed)
         new_articles = []
         feeds_ok = 0
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.warning(f"   ⚠️  RSS exception: {RSS_SOURCES[i]} — {result}")
-            elif isinstance(result, list):
-                new_articles.extend(result)
-                if result:
-                    feeds_ok += 1
-
-        logger.info(f"   📰 Fetched {len(new_articles)} articles from {feeds_ok}/{len(RSS_SOURCES)} working feeds")
+        feeds_unchanged = 0
+        for url, feed in zip(RSS_SOURCES, feeds):
+            if feed is None:
+                feeds_unchanged += 1
+                continue
+            if isinstance(feed, asyncio.TimeoutError):
+                logger.warning(f"   ⏰ RSS timeout ({RSS_FEED_TIMEOUT}s): {url}")
+                continue
+            if isinstance(feed, Exception):
+                logger.warning(f"   ⚠️  RSS failed: {url} — {feed}")
+                continue
+
+            try:
+                articles = self._extract_articles(feed, url, cutoff, now)
+            except Exception as e:
+                logger.warning(f"   ⚠️  RSS failed: {url} — {e}")
+                continue
+
+            if articles:
+                new_articles.extend(articles)
+                feeds_ok += 1
+
+        logger.info(
+            f"   📰 Fetched {len(new_articles)} articles from {feeds_ok}/{len(RSS_SOURCES)} working feeds"
+            f" ({feeds_unchanged} unchanged)"
+        )
         return new_articles
 
+    def _all_items_seen(self, body: bytes) -> bool:
+        """
+        Cheap regex check that a feed has no new articles, so feedparser can be skipped
+
+        Only RSS feeds whose every <item> has a plain <link> qualify; anything
+        else (Atom, link-less items, CDATA) returns False and gets fully parsed.
+        """
+        links = _ITEM_LINK_RE.findall(body)
+        if not links or len(links) != len(_ITEM_RE.findall(body)):
+            return False
+        cache = self.article_cache
+        undated = self._undated_cache
+        for link in links:
+            key = hash(html.unescape(link.decode('utf-8', 'replace')))
+            if key not in cache and key not in undated:
+                return False
+        return True
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session for RSS downloads (lives as long as the detector)"""
+        if self._session is None or self._session.closed:
+            # One connection per feed host is plenty; DNS cached across 15-min cycles
+            connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=RSS_FEED_TIMEOUT),
+                headers={
+                    'User-Agent': _RSS_USER_AGENT,
+                    'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8'
+                }
+            )
+        return self._session
+
+    def _extract_articles(self, entries: List[FeedEntry], url: str, cutoff: datetime, seen_at: datetime) -> List[str]:
+        """
+        Pull new article texts (title + summary) out of a parsed feed
+
+        Skips entries already in article_cache, older than cutoff or too short.
+        Every entry looked at is recorded (article_cache stamped seen_at, or
+        _undated_cache if it has no usable date), so it isn't re-examined and
+        doesn't defeat the _all_items_seen prefilter.
+        """
+        articles = []
+        cache = self.article_cache
+        undated = self._undated_cache
+        # Entry dates are UTC 6-tuples; tuple comparison is the same test as a datetime one
+        cutoff_tuple = cutoff.timetuple()[:6]
+        seen_tuple = seen_at.timetuple()[:6]
+
+        for entry in entries:
+            # Check for duplicate first (more efficient than parsing dates)
+            if not entry.link:
+                continue
+            key = hash(entry.link)
+            if key in cache or key in undated:
+                continue
+
+            # Date filter (lenient: accept articles without dates)
+            if entry.published and entry.published <= cutoff_tuple:
+                self._remember_article(key, seen_at)  # Never qualifies; recorded so _all_items_seen can skip the feed
+                continue
+
+            # Only articles dated up to now age out of the cutoff, so only they may be age-pruned
+            dated = entry.published is not None and entry.published <= seen_tuple
+
+            text = f"{entry.title} {entry.summary}".strip()
+            if len(text) < 20:
+                # Never qualifies; recorded so _all_items_seen can skip the feed
+                self._remember_article(key, seen_at if dated else None)
+                continue
+
+            articles.append(text)
+            self._remember_article(key, seen_at if dated else None)
+
+        if articles:
+            logger.info(f"   ✅ {len(articles)} articles from {url.split('/')[2]}")
+
+        return articles
+
+    def _remember_article(self, key: int, seen_at: Optional[datetime]):
+        """
+        Record an article URL hash as seen, evicting the oldest entry past ARTICLE_CACHE_MAX
+
+        seen_at=None files it in _undated_cache, which the 48h prune never touches.
+        """
+        if seen_at is None:
+            cache = self._undated_cache
+            cache[key] = None
+        else:
+            cache = self.article_cache
+            cache[key] = seen_at
+        if len(cache) > ARTICLE_CACHE_MAX:
+            cache.popitem(last=False)
+
     async def update_narratives(self) -> Optional[Dict]:
         """
         Update narrative topics from latest RSS articles
@@ -207,84 +638,100 @@ class RealtimeNarrativeDetector:
             Dict with top topics and metadata
         """
         try:
-            # Initialize models on first run (may download ~90MB model)
-            logger.info(f"   🔄 Initializing models...")
-            loop = asyncio.get_event_loop()
-            await asyncio.wait_for(
-                loop.run_in_executor(None, self.initialize_models),
-                timeout=120  # 2 min timeout for model download
+            # Fetch latest articles (concurrent, 15s timeout per feed) while the models
+            # load on first run (may download ~90MB model)
+            if not self._models_ready:
+                logger.info(f"   🔄 Initializing models...")
+            new_articles, init_error = await asyncio.gather(
+                self.fetch_rss_feeds(),
+                self.initialize_models_async(),
+                return_exceptions=True
             )
+            if isinstance(new_articles, BaseException):
+                raise new_articles
+
+            articles = self._pending_articles + new_articles
+            embeddings = self._pending_embeddings
 
-            # Fetch latest articles (concurrent, 15s timeout per feed)
-            articles = await self.fetch_rss_feeds()
+            if isinstance(init_error, BaseException):
+                # These URLs are already in article_cache - hold the texts for the next cycle
+                self._pending_articles = articles
+                raise init_error
 
-            if len(articles) < 3:
+            # Embed only what isn't embedded yet; articles held back last cycle keep theirs
+            n_embedded = 0 if embeddings is None else len(embeddings)
+            if len(articles) > n_embedded:
+                new_embeddings = await self._run_model(self._encode, articles[n_embedded:])
+                embeddings = new_embeddings if embeddings is None else np.vstack([embeddings, new_embeddings])
+
+            if len(articles) < BERTOPIC_MIN_BATCH:
+                self._pending_articles, self._pending_embeddings = articles, embeddings
                 if self.current_topics is None:
-                    logger.warning(f"   ⚠️ FIRST NARRATIVE UPDATE: Only {len(articles)} articles found (need 3+). RSS feeds may be failing or empty.")
+                    logger.warning(f"   ⚠️ FIRST NARRATIVE UPDATE: Only {len(articles)} articles found (need {BERTOPIC_MIN_BATCH}+). RSS feeds may be failing or empty.")
                 else:
-                    logger.warning(f"   ⚠️ Too few articles ({len(articles)}), keeping previous narratives")
+                    logger.warning(f"   ⚠️ Too few new articles ({len(articles)}), keeping previous narratives")
                 return None
+            self._pending_articles, self._pending_embeddings = [], None
 
             logger.info(f"   🔄 Running BERTopic on {len(articles)} articles...")
 
-            # Fit or update model (CPU intensive, 60s timeout)
-            if self.current_topics is None:
-                topics, probs = await asyncio.wait_for(
-                    loop.run_in_executor(None, self.topic_model.fit_transform, articles),
-                    timeout=60
-                )
-            else:
-                topics, probs = await asyncio.wait_for(
-                    loop.run_in_executor(None, self.topic_model.transform, articles),
-                    timeout=60
-                )
+            # Learn the new batch into the existing model (CPU intensive, 60s timeout)
+            # Precomputed embeddings skip BERTopic's internal encode
+            await asyncio.wait_for(
+                self._run_model(self.topic_model.partial_fit, articles, embeddings=embeddings),
+                timeout=60
+            )
 
-            # Get top topics
+            # Get top topics (sizes accumulate across partial_fit batches)
             topic_info = self.topic_model.get_topic_info()
 
             # Filter out outlier topic (-1)
             topic_info = topic_info[topic_info['Topic'] != -1]
 
-            # Get top 5 emerging topics
-            top_topics = topic_info.head(5)
+            # Get top 5 emerging topics (online topic ids follow creation order, not size)
+            top_topics = topic_info.sort_values('Count', ascending=False).head(5)
 
-            # Build result
+            # Build result (all topic words fetched once, rows read via itertuples)
+            all_topics = self.topic_model.get_topics()
             result = {
-                'topics': [],
+                'topics': [
+                    {
+                        'id': row.Topic,
+                        'name': row.Name,
+                        'words': [word for word, _ in all_topics.get(row.Topic, [])[:5]],
+                        'doc_count': row.Count
+                    }
+                    for row in top_topics.itertuples(index=False)
+                ],
                 'updated_at': datetime.utcnow(),
                 'article_count': len(articles),
                 'topic_count': len(top_topics)
             }
 
-            logger.info(f"   ✅ Detected {len(top_topics)} emerging narratives:")
-            for idx, row in top_topics.iterrows():
-                topic_id = row['Topic']
-                topic_name = row['Name']
-                doc_count = row['Count']
-
-                # Get top words for this topic
-                topic_words = self.topic_model.get_topic(topic_id)
-                if topic_words:
-                    top_words = [word for word, _ in topic_words[:5]]
-                else:
-                    top_words = []
-
-                result['topics'].append({
-                    'id': topic_id,
-                    'name': topic_name,
-                    'words': top_words,
-                    'doc_count': doc_count
-                })
+            logger.info(
+                f"   ✅ Detected {len(top_topics)} emerging narratives:\n" + "\n".join(
+                    f"      📌 Topic {t['id']}: {t['name']} ({t['doc_count']} docs) - {', '.join(t['words'])}"
+                    for t in result['topics']
+                )
+            )
 
-                logger.info(f"      📌 Topic {topic_id}: {topic_name} ({doc_count} docs) - {', '.join(top_words)}")
+            # Embed all topic word-lists in one batch so scoring a token is a single matmul
+            topic_texts = [' '.join(t['words']) for t in result['topics']]
+            topic_matrix = None
+            if topic_texts:
+                topic_matrix = await self._run_model(self._encode_scoring, topic_texts)
 
+            # Swap topics and their embeddings together so scoring never sees a mismatch
+            self._topic_matrix = topic_matrix
             self.current_topics = result
+            self._token_emb_cache.clear()
             self.last_update = datetime.utcnow()
 
-            # Store in history for momentum tracking
+            # Store in history for momentum tracking (word-sets precomputed for overlap checks)
             self.narrative_history.append({
                 'timestamp': datetime.utcnow(),
                 'topics': result['topics'],
+                'wordsets': [_topic_wordset(t['words']) for t in result['topics']],
                 'article_count': result['article_count']
             })
 
@@ -317,29 +764,22 @@ class RealtimeNarrativeDetector:
 
         try:
             # Count appearances of similar topics in recent history
-            topic_text = ' '.join(topic_words).lower()
-            recent_appearances = 0
-            old_appearances = 0
+            query = _topic_wordset(topic_words)
 
             # Check last 3 updates (recent)
-            for update in self.narrative_history[-3:]:
-                for topic in update['topics']:
-                    hist_topic = ' '.join(topic['words']).lower()
-                    # Simple overlap check (can be improved with embeddings)
-                    overlap = len(set(topic_text.split()) & set(hist_topic.split()))
-                    if overlap >= 2:  # At least 2 words in common
-                        recent_appearances += 1
-                        break
+            # Simple overlap check (can be improved with embeddings): at least 2 words in common
+            recent_appearances = sum(
+                1 for update in self.narrative_history[-3:]
+                if any(len(query & wordset) >= 2 for wordset in update['wordsets'])
+            )
 
             # Check older updates (3-6 updates back)
+            old_appearances = 0
             if len(self.narrative_history) >= 6:
-                for update in self.narrative_history[-6:-3]:
-                    for topic in update['topics']:
-                        hist_topic = ' '.join(topic['words']).lower()
-                        overlap = len(set(topic_text.split()) & set(hist_topic.split()))
-                        if overlap >= 2:
-                            old_appearances += 1
-                            break
+                old_appearances = sum(
+                    1 for update in self.narrative_history[-6:-3]
+                    if any(len(query & wordset) >= 2 for wordset in update['wordsets'])
+                )
 
             # Calculate momentum
             if recent_appearances >= 3:
@@ -380,77 +820,198 @@ class RealtimeNarrativeDetector:
             - points: 0-25 bonus points
             - reason: Explanation (e.g., "Matches 'AI agents' narrative")
         """
-        if not self.current_topics or not self.current_topics.get('topics'):
-            return 0, "No narratives loaded yet"
+        return self.get_narrative_boost_batch([(token_name, token_symbol, token_description)])[0]
 
-        if not self.embedder:
-            return 0, "Embedder not initialized"
+    def get_narrative_boost_batch(self, tokens: List[Tuple[str, str, str]]) -> List[Tuple[int, str]]:
+        """
+        Calculate narrative boosts for a batch of (name, symbol, description) tuples
+
+        Uncached token texts are embedded in one encode call and every token is
+        scored against every topic with one (N x D) @ (D x K) matmul. Results are
+        (points, reason) tuples in input order, same as get_narrative_boost.
+
+        The encode runs inline on the calling thread, outside _embed_sem - callers
+        on the event loop should use get_narrative_boost_batch_async instead.
+        """
+        unavailable = self._boost_unavailable(len(tokens))
+        if unavailable is not None:
+            return unavailable
 
         try:
-            # Combine token metadata into searchable text
-            token_text = f"{token_name} {token_symbol} {token_description or ''}".lower()
+            texts, vecs, miss_texts = self._token_vectors(tokens)
+            miss_vecs = self._encode_scoring(miss_texts) if miss_texts else None
+            return self._score_token_batch(tokens, texts, vecs, miss_texts, miss_vecs)
 
-            # Embed token text
-            token_emb = self.embedder.encode([token_text])
+        except Exception as e:
+            logger.error(f"   ❌ Error calculating narrative boost: {e}")
+            return [(0, f"Error: {e}")] * len(tokens)
 
-            # Check similarity to each top topic
-            max_sim = 0
-            best_topic = None
+    async def get_narrative_boost_batch_async(self, tokens: List[Tuple[str, str, str]]) -> List[Tuple[int, str]]:
+        """
+        Async get_narrative_boost_batch for callers on the event loop
 
-            for topic in self.current_topics['topics']:
-                # Get topic words
-                topic_words = ' '.join(topic['words'])
-                topic_emb = self.embedder.encode([topic_words])
+        With model2vec loaded, cache misses are encoded inline - a static lookup
+        that never contends with torch. The MiniLM fallback goes through the model
+        pool under _embed_sem, but waits at most SCORING_ENCODE_TIMEOUT behind
+        update_narratives work; past that the batch scores 0 ("busy") rather than
+        stalling the conviction path.
+        """
+        unavailable = self._boost_unavailable(len(tokens))
+        if unavailable is not None:
+            return unavailable
 
-                # Cosine similarity
-                sim = np.dot(token_emb[0], topic_emb[0]) / (
-                    np.linalg.norm(token_emb[0]) * np.linalg.norm(topic_emb[0])
-                )
+        try:
+            texts, vecs, miss_texts = self._token_vectors(tokens)
+            miss_vecs = None
+            if miss_texts and self.embedder_fast is not None:
+                miss_vecs = self._encode_scoring(miss_texts)
+            elif miss_texts:
+                try:
+                    miss_vecs = await asyncio.wait_for(
+                        self._run_model(self._encode_scoring, miss_texts),
+                        timeout=SCORING_ENCODE_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    logger.debug(f"   ⏳ Narrative scoring busy ({len(miss_texts)} texts not encoded)")
+                    return [(0, "Narrative scoring busy")] * len(tokens)
+                # Topics may have been swapped while we waited; score against the current ones
+                unavailable = self._boost_unavailable(len(tokens))
+                if unavailable is not None:
+                    return unavailable
+            return self._score_token_batch(tokens, texts, vecs, miss_texts, miss_vecs)
 
-                if sim > max_sim:
-                    max_sim = sim
-                    best_topic = topic
-
-            # Award base points based on similarity
-            base_points = 0
-            reason = ""
-
-            if max_sim > 0.7:
-                # Very strong match
-                base_points = 25
-                reason = f"Strong match to '{best_topic['name']}' narrative"
-            elif max_sim > 0.5:
-                # Strong match
-                base_points = 20
-                reason = f"Matches '{best_topic['name']}' narrative"
-            elif max_sim > 0.4:
-                # Medium match
-                base_points = 15
-                reason = f"Weak match to '{best_topic['name']}' narrative"
-            elif max_sim > 0.3:
-                # Weak match
-                base_points = 10
-                reason = f"Partial match to '{best_topic['name']}'"
-            else:
-                reason = f"No strong narrative match (max sim: {max_sim:.2f})"
+        except Exception as e:
+            logger.error(f"   ❌ Error calculating narrative boost: {e}")
+            return [(0, f"Error: {e}")] * len(tokens)
 
-            # Apply momentum multiplier if we have a match
-            points = base_points
-            if base_points > 0 and best_topic:
-                momentum_mult, momentum_reason = self.get_narrative_momentum(best_topic['words'])
-                if momentum_mult > 1.0:
-                    points = int(base_points * momentum_mult)
-                    reason = f"{reason} + {momentum_reason}"
-                    logger.info(f"   📈 Momentum boost: {base_points} → {points} pts ({momentum_mult:.1f}x)")
+    def _boost_unavailable(self, count: int) -> Optional[List[Tuple[int, str]]]:
+        """Zero boosts (with the reason) when there's nothing to score against, else None"""
+        if not self.current_topics or not self.current_topics.get('topics'):
+            return [(0, "No narratives loaded yet")] * count
 
-            if points > 0:
-                logger.info(f"   🎯 Narrative boost: ${token_symbol} +{points} pts ({reason})")
+        if not self.embedder or self._topic_matrix is None:
+            return [(0, "Embedder not initialized")] * count
 
-            return points, reason
+        if not count:
+            return []
 
-        except Exception as e:
-            logger.error(f"   ❌ Error calculating narrative boost: {e}")
-            return 0, f"Error: {e}"
+        return None
+
+    def _token_vectors(self, tokens: List[Tuple[str, str, str]]):
+        """
+        Searchable texts for (name, symbol, description) tuples, their cached
+        embeddings (None on a miss) and the deduped texts that still need encoding
+        """
+        # Combine token metadata into searchable text
+        texts = [f"{name} {symbol} {description or ''}".lower() for name, symbol, description in tokens]
+        vecs = [self._cached_token_embedding(text) for text in texts]
+        miss_texts = list(dict.fromkeys(text for text, vec in zip(texts, vecs) if vec is None))
+        return texts, vecs, miss_texts
+
+    def _score_token_batch(
+        self,
+        tokens: List[Tuple[str, str, str]],
+        texts: List[str],
+        vecs: List[Optional[np.ndarray]],
+        miss_texts: List[str],
+        miss_vecs: Optional[np.ndarray]
+    ) -> List[Tuple[int, str]]:
+        """Cache the freshly encoded misses, then score every token against every topic"""
+        if miss_texts:
+            encoded = dict(zip(miss_texts, miss_vecs))
+            for text, vec in encoded.items():
+                self._store_token_embedding(text, vec)
+            vecs = [encoded[text] if vec is None else vec for text, vec in zip(texts, vecs)]
+
+        # (N, K) cosine similarities (all rows are unit vectors)
+        sims = np.vstack(vecs) @ self._topic_matrix.T
+        best_idx = sims.argmax(axis=1)
+        best_sim = sims[np.arange(len(tokens)), best_idx]
+        # right=True: strictly above a threshold to reach its tier
+        tiers = np.digitize(best_sim, NARRATIVE_SIM_THRESHOLDS, right=True)
+
+        topics = self.current_topics['topics']
+        return [
+            self._narrative_boost(symbol, topics[idx], float(sim), int(tier))
+            for (_, symbol, _), idx, sim, tier in zip(tokens, best_idx, best_sim, tiers)
+        ]
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as an (n, 384) float32 array of unit vectors"""
+        return self.embedder.encode(
+            texts,
+            batch_size=ENCODE_BATCH_SIZE,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+
+    def _encode_scoring(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed topic/token texts for narrative scoring as unit vectors
+
+        Uses the static model2vec embedder when loaded, else MiniLM. Topic matrix
+        and token vectors always come from here, so they share one space.
+        """
+        if self.embedder_fast is None:
+            return self._encode(texts)
+        embeddings = np.asarray(self.embedder_fast.encode(texts), dtype=np.float32)
+        return embeddings / (np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12)
+
+    async def _run_model(self, fn, *args, **kwargs):
+        """
+        Run a blocking embedder/BERTopic call on the model pool, one at a time (per _embed_sem)
+
+        The semaphore is released when the executor call finishes, not when the
+        caller stops waiting - a timed-out await can't let the next call overlap it.
+        """
+        sem = self._embed_sem
+        await sem.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(_model_executor, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            sem.release()
+            raise
+        future.add_done_callback(lambda _: sem.release())
+        # Shielded so cancelling the caller doesn't mark the future done while its thread still runs
+        return await asyncio.shield(future)
+
+    def _cached_token_embedding(self, token_text: str) -> Optional[np.ndarray]:
+        """LRU lookup in the token embedding cache"""
+        token_vec = self._token_emb_cache.get(token_text)
+        if token_vec is not None:
+            self._token_emb_cache.move_to_end(token_text)
+        return token_vec
+
+    def _store_token_embedding(self, token_text: str, token_vec: np.ndarray):
+        """Insert into the token embedding cache, evicting the least recently used"""
+        cache = self._token_emb_cache
+        cache[token_text] = token_vec
+        if len(cache) > TOKEN_EMB_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _narrative_boost(self, token_symbol: str, best_topic: Dict, max_sim: float, tier: int) -> Tuple[int, str]:
+        """(points, reason) for a token's best topic match at the given ladder tier, with momentum"""
+        base_points, template = NARRATIVE_SIM_TIERS[tier]
+        if base_points:
+            reason = template.format(name=best_topic['name'])
+        else:
+            reason = f"No strong narrative match (max sim: {max_sim:.2f})"
+
+        # Apply momentum multiplier if we have a match
+        points = base_points
+        if base_points > 0 and best_topic:
+            momentum_mult, momentum_reason = self.get_narrative_momentum(best_topic['words'])
+            if momentum_mult > 1.0:
+                points = int(base_points * momentum_mult)
+                reason = f"{reason} + {momentum_reason}"
+                logger.info(f"   📈 Momentum boost: {base_points} → {points} pts ({momentum_mult:.1f}x)")
+
+        if points > 0:
+            logger.info(f"   🎯 Narrative boost: ${token_symbol} +{points} pts ({reason})")
+
+        return points, reason
 
     async def narrative_loop(self):
         """
@@ -463,8 +1024,11 @@ class RealtimeNarrativeDetector:
         logger.info(f"   🤖 Model: all-MiniLM-L6-v2 (will download ~90MB on first run)")
 
         iteration = 0
+        next_tick = time.monotonic()
         while self.is_running:
             iteration += 1
+            # Fixed-rate schedule: cycles start update_interval apart regardless of work time
+            next_tick += self.update_interval
             try:
                 logger.info(f"\n📰 [Narrative Loop #{iteration}] Updating from RSS feeds...")
                 await self.update_narratives()
@@ -487,7 +1051,7 @@ class RealtimeNarrativeDetector:
                             f"- {narrative['momentum_reason']}"
                         )
 
-                logger.info(f"✅ Narrative update complete. Next update in {self.update_interval}s\n")
+                logger.info(f"✅ Narrative update complete. Next update in {max(0, next_tick - time.monotonic()):.0f}s\n")
 
             except asyncio.TimeoutError:
                 logger.error(f"❌ Narrative loop #{iteration} timed out (model init or BERTopic too slow)")
@@ -496,7 +1060,17 @@ class RealtimeNarrativeDetector:
                 import traceback
                 logger.error(traceback.format_exc())
 
-            await asyncio.sleep(self.update_interval)
+            now = time.monotonic()
+            if now > next_tick:
+                # Overran the interval - skip the missed slots rather than running back-to-back
+                missed = math.ceil((now - next_tick) / self.update_interval)
+                logger.warning(f"⚠️ Narrative loop #{iteration} overran its {self.update_interval}s slot, skipping {missed} slot(s)")
+                next_tick += self.update_interval * missed
+            await asyncio.sleep(max(0, next_tick - time.monotonic()))
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     def get_trending_narratives(self) -> List[Dict]:
         """
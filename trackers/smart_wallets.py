@@ -2,9 +2,12 @@
 Smart Wallet Tracker - Updated with GMGN metadata auto-fetching
 Auto-fetches wallet stats (win_rate, pnl_30d, name) from GMGN.ai (direct HTML scraping, no Apify)
 """
-from typing import Dict, List
+import asyncio
+from collections import deque
+from typing import Deque, Dict, List
 from datetime import datetime, timedelta
 from loguru import logger
+from config import WEIGHTS
 from data.curated_wallets import get_all_tracked_wallets, get_wallet_info
 from gmgn_direct_fetcher import get_gmgn_direct_fetcher
 
@@ -18,16 +21,26 @@ IGNORE_TOKENS = {
     'DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263',  # Bonk (alternate)
 }
 
+# Keep only the last N buys per token in memory
+RECENT_BUYS_PER_TOKEN = 20
+
+# Buys are saved to the database in batches by a background writer
+DB_FLUSH_BATCH = 100  # Max rows per insert batch
+DB_FLUSH_INTERVAL = 1.0  # Seconds to let a burst of buys collect before writing
+DB_FLUSH_TIMEOUT = 10.0  # Seconds stop() waits for queued buys to be saved
+
 
 class SmartWalletTracker:
     """Tracks wallet activity of known successful traders via Helius webhooks"""
     
     def __init__(self):
         self.tracked_wallets = {}
-        self.recent_buys: Dict[str, List[dict]] = {}  # token -> [{wallet, info, time}]
+        self.recent_buys: Dict[str, Deque[dict]] = {}  # token -> last RECENT_BUYS_PER_TOKEN [{wallet, info, time}]
         self.db = None  # Set externally after initialization
         self.save_failures = 0
         self.save_successes = 0
+        self._pending_writes: asyncio.Queue = asyncio.Queue()  # Row tuples -> _db_flusher (None stops it)
+        self._flusher_task = None
         
     async def start(self):
         """Initialize smart wallet tracking"""
@@ -45,6 +58,9 @@ class SmartWalletTracker:
         logger.info(f"   👑 Top KOLs: {top_kol_count}")
         logger.info(f"   📊 Total tracked: {len(self.tracked_wallets)}")
         logger.info(f"   💾 Database: {'enabled' if self.db else 'NOT SET (memory-only)'}")
+
+        if self.db and self._flusher_task is None:
+            self._flusher_task = asyncio.create_task(self._db_flusher())
         
         return True
     
@@ -67,13 +83,12 @@ class SmartWalletTracker:
             # Get the wallet that made the transaction
             fee_payer = tx_data.get('feePayer', '')
             
-            # Check if this is a tracked wallet
-            if fee_payer not in self.tracked_wallets:
+            # Check if this is a tracked wallet and get its info (has enriched names with fallbacks)
+            # in a single lookup
+            wallet_info = self.tracked_wallets.get(fee_payer)
+            if wallet_info is None:
                 logger.debug(f"⏭️  Skipping non-tracked wallet: {fee_payer[:8]}...")
                 return
-
-            # Get wallet info from tracked wallets (has enriched names with fallbacks)
-            wallet_info = self.tracked_wallets[fee_payer]
             if not wallet_info:
                 logger.warning(f"⚠️ No wallet info for tracked wallet: {fee_payer[:8]}")
                 return
@@ -99,30 +114,32 @@ class SmartWalletTracker:
             
             # Look for token buys (receiving tokens)
             for transfer in token_transfers:
-                to_address = transfer.get('toUserAccount', '')
-                
-                if to_address == fee_payer:
-                    token_address = transfer.get('mint', '')
-                    amount = transfer.get('tokenAmount', 0)
-
-                    if token_address and amount > 0:
-                        # Skip ignored tokens (SOL, stablecoins, etc.)
-                        if token_address in IGNORE_TOKENS:
-                            logger.debug(f"⏭️  Skipping ignored token: {token_address[:8]}...")
-                            continue
-
-                        # Record the buy
-                        success = await self._record_buy(
-                            wallet_address=fee_payer,
-                            wallet_info=wallet_info,
-                            token_address=token_address,
-                            amount=amount,
-                            timestamp=tx_time,
-                            signature=signature
-                        )
-
-                        status_emoji = "✅" if success else "⚠️"
-                        logger.info(f"👑 {wallet_info['name']} ({wallet_info['tier']}) bought {token_address[:8]}... {status_emoji}")
+                # Most transfers in a multi-hop swap go elsewhere - skip them before anything else
+                if transfer.get('toUserAccount') != fee_payer:
+                    continue
+
+                token_address = transfer.get('mint')
+                amount = transfer.get('tokenAmount', 0)
+                if not token_address or amount <= 0:
+                    continue
+
+                # Skip ignored tokens (SOL, stablecoins, etc.)
+                if token_address in IGNORE_TOKENS:
+                    logger.debug(f"⏭️  Skipping ignored token: {token_address[:8]}...")
+                    continue
+
+                # Record the buy
+                success = await self._record_buy(
+                    wallet_address=fee_payer,
+                    wallet_info=wallet_info,
+                    token_address=token_address,
+                    amount=amount,
+                    timestamp=tx_time,
+                    signature=signature
+                )
+
+                status_emoji = "✅" if success else "⚠️"
+                logger.info(f"👑 {wallet_info['name']} ({wallet_info['tier']}) bought {token_address[:8]}... {status_emoji}")
             
         except Exception as e:
             logger.error(f"❌ Error processing transaction: {e}")
@@ -138,7 +155,7 @@ class SmartWalletTracker:
         timestamp: datetime,
         signature: str
     ) -> bool:
-        """Record a smart wallet buy. Returns True if saved to DB successfully."""
+        """Record a smart wallet buy. Returns True if queued for the database."""
 
         # Auto-fetch metadata from GMGN if enabled
         if wallet_info.get('fetch_metadata', False):
@@ -173,11 +190,12 @@ class SmartWalletTracker:
                 'pnl_30d': wallet_info.get('pnl_30d', 0)
             }
 
-        # Add to in-memory cache ALWAYS (this is fast)
-        if token_address not in self.recent_buys:
-            self.recent_buys[token_address] = []
+        # Add to in-memory cache ALWAYS (this is fast; the deque drops the oldest buy past the cap)
+        token_buys = self.recent_buys.get(token_address)
+        if token_buys is None:
+            token_buys = self.recent_buys[token_address] = deque(maxlen=RECENT_BUYS_PER_TOKEN)
 
-        self.recent_buys[token_address].append({
+        token_buys.append({
             'wallet': wallet_address,
             'name': wallet_info['name'],
             'tier': wallet_info['tier'],
@@ -187,70 +205,108 @@ class SmartWalletTracker:
             'timestamp': timestamp,
             'signature': signature
         })
-        
-        # Keep only last 20 buys per token in memory
-        if len(self.recent_buys[token_address]) > 20:
-            self.recent_buys[token_address] = self.recent_buys[token_address][-20:]
-        
+
         logger.debug(f"📝 Added to memory: {wallet_info['name']} -> {token_address[:8]}")
         
-        # Try to persist to database
+        # Queue for the background database writer (batched, off the webhook path)
         if not self.db:
             logger.debug(f"⚠️ No database configured - memory only")
             return False
-        
+
+        self._pending_writes.put_nowait((
+            wallet_address,
+            wallet_info['name'],
+            wallet_info['tier'],
+            token_address,
+            'buy',  # Always 'buy' for KOL purchases
+            amount,
+            signature,
+            timestamp,
+            wallet_info.get('win_rate'),  # Save win rate from curated_wallets
+            wallet_info.get('pnl_30d')    # Save 30d PnL from curated_wallets
+        ))
+        logger.debug(f"💾 Queued for database: {signature}")
+        return True
+
+    async def _db_flusher(self):
+        """
+        Background writer: drains queued buys and saves them in batches
+
+        Unless a full batch is already waiting, sleeps DB_FLUSH_INTERVAL after the
+        first queued row so a burst of buys shares one round-trip. Exits after
+        saving everything queued ahead of the None sentinel.
+        """
+        queue = self._pending_writes
+        while True:
+            row = await queue.get()
+            if row is None:
+                return
+
+            if queue.qsize() < DB_FLUSH_BATCH - 1:
+                await asyncio.sleep(DB_FLUSH_INTERVAL)
+
+            rows = [row]
+            stopping = False
+            while len(rows) < DB_FLUSH_BATCH and not queue.empty():
+                row = queue.get_nowait()
+                if row is None:
+                    stopping = True
+                    break
+                rows.append(row)
+
+            await self._save_rows(rows)
+            if stopping:
+                return
+
+    async def _save_rows(self, rows: List[tuple]):
+        """Persist a batch of queued buys, falling back to row-by-row if the batch fails"""
         try:
-            logger.debug(f"💾 Attempting database save...")
-            logger.debug(f"   Wallet: {wallet_address}")
-            logger.debug(f"   Name: {wallet_info['name']}")
-            logger.debug(f"   Token: {token_address}")
-            logger.debug(f"   Signature: {signature}")
-            
-            # Call the database insert method with KOL metadata
-            await self.db.insert_smart_wallet_activity(
-                wallet_address=wallet_address,
-                wallet_name=wallet_info['name'],
-                wallet_tier=wallet_info['tier'],
-                token_address=token_address,
-                transaction_type='buy',  # Always 'buy' for KOL purchases
-                amount=amount,
-                transaction_signature=signature,
-                timestamp=timestamp,
-                win_rate=wallet_info.get('win_rate'),  # Save win rate from curated_wallets
-                pnl_30d=wallet_info.get('pnl_30d')     # Save 30d PnL from curated_wallets
-            )
-            
-            self.save_successes += 1
-            logger.info(f"💾 ✅ Saved to database (total: {self.save_successes})")
-            
-            # Log stats every 10 saves
-            if self.save_successes % 10 == 0:
-                logger.info(f"📊 Database stats: {self.save_successes} saves, {self.save_failures} failures")
-            
-            return True
-            
-        except AttributeError as e:
-            logger.error(f"❌ Database method missing: {e}")
-            logger.error(f"   Your Database class needs an 'insert_kol_buy()' method!")
-            self.save_failures += 1
-            return False
-            
+            await self.db.insert_smart_wallet_activity_batch(rows)
+            saved = len(rows)
+
         except Exception as e:
-            logger.error(f"❌ Database save FAILED: {e}")
-            logger.error(f"   Error type: {type(e).__name__}")
-            
-            # Show full traceback for first few failures
-            if self.save_failures < 3:
-                import traceback
-                logger.error(traceback.format_exc())
-            
-            self.save_failures += 1
-            
-            # Alert every 10 failures
-            if self.save_failures % 10 == 0:
-                logger.error(f"🚨 Total database failures: {self.save_failures}")
-            
-            return False
+            logger.error(f"❌ Database batch save FAILED ({len(rows)} rows): {e} - retrying individually")
+            saved = 0
+            for row in rows:
+                try:
+                    await self.db.insert_smart_wallet_activity(*row)
+                    saved += 1
+                except Exception as e:
+                    logger.error(f"❌ Database save FAILED for {row[6]}: {e}")
+                    logger.error(f"   Error type: {type(e).__name__}")
+
+                    # Show full traceback for first few failures
+                    if self.save_failures < 3:
+                        import traceback
+                        logger.error(traceback.format_exc())
+
+                    self.save_failures += 1
+
+                    # Alert every 10 failures
+                    if self.save_failures % 10 == 0:
+                        logger.error(f"🚨 Total database failures: {self.save_failures}")
+
+        if not saved:
+            return
+
+        # Log stats every 10 saves
+        previous = self.save_successes
+        self.save_successes += saved
+        logger.info(f"💾 ✅ Saved {saved} buys to database (total: {self.save_successes})")
+        if self.save_successes // 10 > previous // 10:
+            logger.info(f"📊 Database stats: {self.save_successes} saves, {self.save_failures} failures")
+
+    async def stop(self):
+        """Flush queued database writes and stop the background writer"""
+        if self._flusher_task is None:
+            return
+        self._pending_writes.put_nowait(None)  # Flusher saves what's queued, then exits
+        try:
+            await asyncio.wait_for(self._flusher_task, timeout=DB_FLUSH_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Smart wallet DB flush timed out, {self._pending_writes.qsize()} buys not saved")
+        self._flusher_task = None
+        logger.info("Smart wallet tracker stopped")
     
     async def get_smart_wallet_activity(self, token_address: str, hours: int = 24) -> Dict:
         """
@@ -305,23 +361,27 @@ class SmartWalletTracker:
                 'score': 0
             }
         
-        # Get unique wallets
+        # Get unique wallets and count them by tier in one pass
         unique_wallets = {}
+        elite_count = top_kol_count = 0
         for buy in buys:
             wallet = buy['wallet']
-            if wallet not in unique_wallets:
-                unique_wallets[wallet] = {
-                    'name': buy['name'],
-                    'tier': buy['tier'],
-                    'win_rate': buy.get('win_rate', 0),
-                    'pnl_30d': buy.get('pnl_30d', 0),
-                    'first_buy': buy['timestamp'],
-                    'amount': buy['amount']
-                }
-        
-        # Count by tier
-        elite_count = sum(1 for w in unique_wallets.values() if w['tier'] == 'elite')
-        top_kol_count = sum(1 for w in unique_wallets.values() if w['tier'] == 'top_kol')
+            if wallet in unique_wallets:
+                continue
+            tier = buy['tier']
+            unique_wallets[wallet] = {
+                'name': buy['name'],
+                'tier': tier,
+                'win_rate': buy.get('win_rate', 0),
+                'pnl_30d': buy.get('pnl_30d', 0),
+                'first_buy': buy['timestamp'],
+                'amount': buy['amount']
+            }
+            if tier == 'elite':
+                elite_count += 1
+            elif tier == 'top_kol':
+                top_kol_count += 1
+
         other_count = len(unique_wallets) - elite_count - top_kol_count
 
         # Debug: Show tier breakdown
@@ -333,7 +393,6 @@ class SmartWalletTracker:
                     logger.warning(f"   ⚠️ {addr[:8]} has tier='{info['tier']}' (should be 'top_kol')")
 
         # Calculate score (use your config weights)
-        from config import WEIGHTS
         score = 0
         score += elite_count * WEIGHTS.get('smart_wallet_elite', 15)
         score += top_kol_count * WEIGHTS.get('smart_wallet_kol', 10)
@@ -365,10 +424,10 @@ class SmartWalletTracker:
         cutoff = datetime.utcnow() - timedelta(hours=24)
         
         for token_address in list(self.recent_buys.keys()):
-            self.recent_buys[token_address] = [
-                buy for buy in self.recent_buys[token_address]
-                if buy['timestamp'] > cutoff
-            ]
+            self.recent_buys[token_address] = deque(
+                (buy for buy in self.recent_buys[token_address] if buy['timestamp'] > cutoff),
+                maxlen=RECENT_BUYS_PER_TOKEN
+            )
             
             if not self.recent_buys[token_address]:
                 del self.recent_buys[token_address]